@@ -0,0 +1,58 @@
+"""
+Costruzione del contesto LLM dai risultati di ricerca.
+
+Research e Synthesis Agent camminavano entrambi su ``web_results`` e
+``news_results`` per costruire lo stesso blocco di snippet. Il builder
+condiviso fa il lavoro una volta per dict di ricerca e memoizza il
+risultato dentro il dict stesso (chiave privata ``_snippet_block``),
+così il secondo agente lo riusa gratis.
+"""
+
+from typing import Dict
+
+from config import ANALYSIS_MAX_WEB_SOURCES, ANALYSIS_MAX_NEWS_SOURCES
+
+_CACHE_KEY = "_snippet_block"
+
+
+def build_snippet_block(
+    data: Dict,
+    web_limit: int = ANALYSIS_MAX_WEB_SOURCES,
+    news_limit: int = ANALYSIS_MAX_NEWS_SOURCES
+) -> str:
+    """
+    Blocco testuale con gli snippet web e le news di un dict di ricerca.
+
+    Args:
+        data: Risultati del Research Agent (web_results / news_results)
+        web_limit: Risultati web massimi inclusi
+        news_limit: News massime incluse
+
+    Returns:
+        Blocco pronto da inserire in un prompt (memoizzato in ``data``)
+    """
+    cached = data.get(_CACHE_KEY)
+    if cached is not None:
+        return cached
+
+    parts = []
+
+    web = data.get("web_results", [])[:web_limit]
+    if web:
+        parts.append("## Risultati Web:")
+        for i, r in enumerate(web, 1):
+            title = r.get("title") or "N/A"
+            snippet = (r.get("body") or r.get("snippet") or "")[:200]
+            parts.append(f"{i}. {title}: {snippet}")
+
+    news = data.get("news_results", [])[:news_limit]
+    if news:
+        parts.append("\n## News:")
+        for i, r in enumerate(news, 1):
+            title = r.get("title") or "N/A"
+            source = r.get("source") or ""
+            parts.append(f"{i}. [{source}] {title}")
+
+    block = "\n".join(parts)
+    data[_CACHE_KEY] = block
+    return block
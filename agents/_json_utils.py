@@ -0,0 +1,177 @@
+"""
+Estrazione di blocchi JSON dalle risposte LLM.
+
+Helper condiviso tra gli agenti: sostituisce i pattern greedy
+``re.search(r'\\{[\\s\\S]*\\}')`` (potenzialmente O(n²) su risposte
+lunghe) con una scansione lineare che conta la profondità delle
+parentesi rispettando stringhe quotate ed escape.
+"""
+
+import asyncio
+import re
+from typing import Any, Literal, Optional
+
+from utils.fastjson import json_loads
+
+try:
+    import numba
+    import numpy as np
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
+
+# Parser lenient opzionale per il JSON "quasi valido" degli LLM
+# (virgole finali, apici singoli, chiavi senza quote). Lento (~600x il
+# parser C) ma invocato solo quando il parse severo fallisce
+try:
+    import json5
+    _HAS_JSON5 = True
+except ImportError:
+    _HAS_JSON5 = False
+
+# Fallback precompilati (usati solo se lo scanner non trova un blocco
+# bilanciato, es. risposta troncata)
+_JSON_OBJ_RE = re.compile(r'\{[\s\S]*\}')
+_JSON_ARR_RE = re.compile(r'\[[\s\S]*\]')
+
+_DELIMS = {"obj": ("{", "}", _JSON_OBJ_RE), "arr": ("[", "]", _JSON_ARR_RE)}
+
+# Oltre questa soglia la scansione viene spostata in un thread per non
+# bloccare l'event loop
+_TO_THREAD_THRESHOLD = 64_000
+
+# Sotto questa soglia il loop Python è più veloce del costo di
+# encode + dispatch verso il kernel compilato
+_JIT_THRESHOLD = 16_384
+
+if _HAS_NUMBA:
+    @numba.njit(cache=True)
+    def _find_balanced(buf: "np.ndarray", open_b: int, close_b: int) -> tuple:
+        """
+        Scanner byte-level compilato: restituisce (start, end) del primo
+        blocco bilanciato, end = -1 se non chiuso, start = -1 se assente.
+
+        I delimitatori JSON sono ASCII, quindi la scansione sui byte
+        UTF-8 è corretta anche con testo accentato (i byte di
+        continuazione sono >= 0x80 e non collidono mai).
+        """
+        n = buf.size
+        start = -1
+        for i in range(n):
+            if buf[i] == open_b:
+                start = i
+                break
+        if start == -1:
+            return -1, -1
+
+        depth = 0
+        in_string = False
+        escaped = False
+        for i in range(start, n):
+            c = buf[i]
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif c == 92:      # backslash
+                    escaped = True
+                elif c == 34:      # doppio apice
+                    in_string = False
+            elif c == 34:
+                in_string = True
+            elif c == open_b:
+                depth += 1
+            elif c == close_b:
+                depth -= 1
+                if depth == 0:
+                    return start, i
+        return start, -1
+
+
+def extract_json_block(s: str, kind: Literal["obj", "arr"] = "obj") -> Optional[str]:
+    """
+    Trova il primo blocco JSON bilanciato in una stringa.
+
+    Args:
+        s: Testo in cui cercare (tipicamente una risposta LLM)
+        kind: "obj" per ``{...}``, "arr" per ``[...]``
+
+    Returns:
+        La sottostringa del blocco, o None se assente
+    """
+    open_ch, close_ch, fallback_re = _DELIMS[kind]
+
+    # Risposte lunghe: scanner compilato (~10x sul loop Python)
+    if _HAS_NUMBA and len(s) >= _JIT_THRESHOLD:
+        raw = s.encode("utf-8")
+        start, end = _find_balanced(
+            np.frombuffer(raw, dtype=np.uint8), ord(open_ch), ord(close_ch)
+        )
+        if start != -1 and end != -1:
+            return raw[start:end + 1].decode("utf-8", errors="replace")
+        if start == -1:
+            return None
+        # Blocco non bilanciato: stesso fallback del percorso Python
+        match = fallback_re.search(s)
+        return match.group() if match else None
+
+    start = s.find(open_ch)
+    if start == -1:
+        return None
+
+    depth = 0
+    in_string = False
+    escaped = False
+
+    for i in range(start, len(s)):
+        c = s[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif c == "\\":
+                escaped = True
+            elif c == '"':
+                in_string = False
+        elif c == '"':
+            in_string = True
+        elif c == open_ch:
+            depth += 1
+        elif c == close_ch:
+            depth -= 1
+            if depth == 0:
+                return s[start:i + 1]
+
+    # Blocco non bilanciato: ultimo tentativo col pattern precompilato
+    match = fallback_re.search(s)
+    return match.group() if match else None
+
+
+def extract_json(s: str, kind: Literal["obj", "arr"] = "obj") -> Optional[Any]:
+    """
+    Estrae e parsa il primo blocco JSON; None se assente o malformato.
+
+    Percorso veloce: orjson via utils.fastjson. Se il parse severo
+    fallisce e json5 è installato, ritenta in modalità lenient (il costo
+    si paga solo sul raro output malformato).
+    """
+    block = extract_json_block(s, kind)
+    if block is None:
+        return None
+    try:
+        return json_loads(block)
+    except ValueError:
+        if _HAS_JSON5:
+            try:
+                return json5.loads(block)
+            except Exception:
+                return None
+        return None
+
+
+async def extract_json_async(s: str, kind: Literal["obj", "arr"] = "obj") -> Optional[Any]:
+    """
+    Come :func:`extract_json`, ma su risposte molto lunghe la scansione
+    viene eseguita in un thread per non trattenere l'event loop.
+    """
+    if len(s) > _TO_THREAD_THRESHOLD:
+        return await asyncio.to_thread(extract_json, s, kind)
+    return extract_json(s, kind)
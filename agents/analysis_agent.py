@@ -8,7 +8,12 @@ Responsabilità:
 - Strutturazione dati non strutturati
 """
 
-import json
+import asyncio
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import zip_longest
 from typing import Any, Dict, List, Optional
 from pathlib import Path
 from datetime import datetime
@@ -20,6 +25,17 @@ from .base_agent import (
     AgentCapability,
     get_registry
 )
+from ._json_utils import extract_json_block
+from .entity_utils import normalize_entity_categories
+
+from utils.fastjson import json_loads
+from utils.token_budget import count_tokens, fit
+
+from config import (
+    ANALYSIS_MAX_WEB_SOURCES,
+    ANALYSIS_MAX_NEWS_SOURCES,
+    ANALYSIS_MAX_DEEP_SOURCES
+)
 
 
 ANALYSIS_AGENT_PROMPT = """Sei un Analysis Agent specializzato nell'analisi di documenti e dati.
@@ -40,9 +56,96 @@ Rispondi in italiano. Sii preciso e metodico.
 """
 
 
+# =============================================================================
+# Costanti modulo
+# =============================================================================
+
+# Euristica "c'è qualcosa da estrarre?": token capitalizzati o cifre
+_EXTRACTABLE_RE = re.compile(r'[A-Z][a-zà-ú]+|\d')
+
+# Categorie restituite da extract_entities
+_ENTITY_CATEGORIES = (
+    "persons", "organizations", "locations", "dates", "numbers", "concepts"
+)
+
+
+# =============================================================================
+# Parsing documenti (CPU-bound, eseguito fuori dall'event loop)
+# =============================================================================
+
+# Pagine PDF per task quando si parallelizza l'estrazione
+_PDF_PAGES_PER_TASK = 50
+
+# Pool di processi condiviso, creato pigramente al primo parsing
+_parse_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_parse_pool() -> ProcessPoolExecutor:
+    """Restituisce il pool di processi per il parsing (singleton)."""
+    global _parse_pool
+    if _parse_pool is None:
+        _parse_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+    return _parse_pool
+
+
+def _pdf_page_count(path: str) -> int:
+    """Conta le pagine di un PDF (eseguito nel pool)."""
+    from .pdf_backends import page_count
+    return page_count(path)
+
+
+def _extract_pdf_pages(path: str, start: int, end: int) -> str:
+    """Estrae il testo delle pagine [start, end) di un PDF (nel pool)."""
+    from .pdf_backends import extract_pages
+    return extract_pages(path, start, end)
+
+
+def _extract_docx(path: str) -> str:
+    """Estrae il testo da un DOCX (eseguito nel pool)."""
+    from docx import Document
+    doc = Document(path)
+    return "\n".join(p.text for p in doc.paragraphs)
+
+
+@lru_cache(maxsize=64)
+def _format_sources(sources_key: tuple) -> str:
+    """
+    Contesto fonti per il fact-checking, memoizzato.
+
+    La stessa lista di fonti viene spesso verificata contro molti set
+    di claim: la chiave è la tupla (titolo, contenuto troncato) per
+    fonte, così il contesto formattato si ricostruisce una volta sola.
+    """
+    return "\n\n".join(
+        f"[{i}] {title}: {content}"
+        for i, (title, content) in enumerate(sources_key, 1)
+    )
+
+
+def _prep_source(source: Dict, kind: str) -> str:
+    """
+    Prepara la riga di contesto per una singola fonte.
+
+    Funzione pura, pensata per essere eseguita via asyncio.to_thread
+    così che troncamento/formattazione non blocchino l'event loop.
+    """
+    if kind == "web":
+        title = source.get("title", "")
+        snippet = fit(source.get("body", source.get("snippet", "")), 60)
+        return f"- {title}: {snippet}"
+
+    if kind == "news":
+        return f"- [{source.get('source', '')}] {source.get('title', '')}"
+
+    # deep content
+    return f"---\n{fit(source.get('content', ''), 300)}\n---"
+
+
 class AnalysisAgent(BaseAgent):
     """Agente per analisi documenti e dati."""
-    
+
+    __slots__ = ()
+
     def __init__(self, model: Optional[str] = None):
         super().__init__(
             agent_id="analysis_agent",
@@ -52,7 +155,7 @@ class AnalysisAgent(BaseAgent):
             model=model
         )
     
-    def get_capabilities(self) -> List[AgentCapability]:
+    def _build_capabilities(self) -> List[AgentCapability]:
         return [
             AgentCapability(
                 name="analyze_document",
@@ -155,7 +258,7 @@ class AnalysisAgent(BaseAgent):
         
         # Analisi con LLM
         focus_str = ", ".join(focus_areas) if focus_areas else "tutti gli aspetti rilevanti"
-        
+
         prompt = f"""Analizza questo documento concentrandoti su: {focus_str}
 
 Fornisci:
@@ -168,52 +271,100 @@ Fornisci:
 
 Rispondi in formato JSON."""
 
-        context = f"DOCUMENTO:\n{text[:8000]}"  # Limita lunghezza
-        
-        response = await self.invoke_llm(prompt, context)
-        
-        # Prova parsing JSON
-        try:
-            import re
-            json_match = re.search(r'\{[\s\S]*\}', response)
-            if json_match:
-                analysis = json.loads(json_match.group())
-            else:
-                analysis = {"raw_analysis": response}
-        except json.JSONDecodeError:
-            analysis = {"raw_analysis": response}
-        
+        # Documenti lunghi: analizza chunk sovrapposti in parallelo
+        chunks = self._split_text(text, chunk_size=8000, overlap=500)
+
+        if len(chunks) == 1:
+            response = await self.invoke_llm_json(prompt, f"DOCUMENTO:\n{chunks[0]}")
+            analysis = self._parse_json_response(response)
+        else:
+            responses = await self.batch_invoke_llm([
+                (prompt, f"DOCUMENTO (parte {i}/{len(chunks)}):\n{chunk}")
+                for i, chunk in enumerate(chunks, 1)
+            ], json_mode=True)
+            analysis = {
+                "chunk_analyses": [self._parse_json_response(r) for r in responses],
+                "chunks_count": len(chunks)
+            }
+
         analysis["document_length"] = len(text)
         analysis["analyzed_at"] = datetime.now().isoformat()
-        
+
         return analysis
+
+    @staticmethod
+    def _split_text(text: str, chunk_size: int = 8000, overlap: int = 500) -> List[str]:
+        """Divide un testo in chunk sovrapposti per analisi parallela."""
+        if len(text) <= chunk_size:
+            return [text]
+
+        chunks = []
+        step = chunk_size - overlap
+        for start in range(0, len(text), step):
+            chunks.append(text[start:start + chunk_size])
+            if start + chunk_size >= len(text):
+                break
+        return chunks
+
+    @staticmethod
+    def _parse_json_response(response: str) -> Dict[str, Any]:
+        """Estrae il blocco JSON da una risposta LLM (fallback: testo grezzo)."""
+        block = extract_json_block(response)
+        if block:
+            try:
+                return json_loads(block)
+            except ValueError:
+                pass
+        return {"raw_analysis": response}
     
     async def _read_document(self, path: str) -> str:
-        """Legge un documento (PDF, DOCX, TXT)."""
+        """
+        Legge un documento (PDF, DOCX, TXT).
+
+        Il parsing PDF/DOCX è CPU-bound: viene eseguito in un pool di
+        processi per non bloccare l'event loop. I PDF lunghi vengono
+        estratti a blocchi di pagine in parallelo.
+        """
         file_path = Path(path)
-        
+
         if not file_path.exists():
             self.log(f"File non trovato: {path}", "ERROR")
             return ""
-        
+
         ext = file_path.suffix.lower()
-        
+        loop = asyncio.get_running_loop()
+
         try:
             if ext == ".pdf":
-                from pypdf import PdfReader
-                reader = PdfReader(str(file_path))
-                text = "\n".join(page.extract_text() or "" for page in reader.pages)
-                
+                pool = _get_parse_pool()
+                total_pages = await loop.run_in_executor(
+                    pool, _pdf_page_count, str(file_path)
+                )
+                if total_pages > _PDF_PAGES_PER_TASK:
+                    # Estrazione parallela a blocchi di pagine
+                    parts = await asyncio.gather(*(
+                        loop.run_in_executor(
+                            pool, _extract_pdf_pages,
+                            str(file_path), start, start + _PDF_PAGES_PER_TASK
+                        )
+                        for start in range(0, total_pages, _PDF_PAGES_PER_TASK)
+                    ))
+                    text = "\n".join(parts)
+                else:
+                    text = await loop.run_in_executor(
+                        pool, _extract_pdf_pages, str(file_path), 0, total_pages
+                    )
+
             elif ext in [".docx", ".doc"]:
-                from docx import Document
-                doc = Document(str(file_path))
-                text = "\n".join(p.text for p in doc.paragraphs)
-                
+                text = await loop.run_in_executor(
+                    _get_parse_pool(), _extract_docx, str(file_path)
+                )
+
             else:  # txt, md, etc.
                 text = file_path.read_text(encoding="utf-8")
-            
+
             return text
-            
+
         except Exception as e:
             self.log(f"Errore lettura {path}: {e}", "ERROR")
             return ""
@@ -227,7 +378,11 @@ Rispondi in formato JSON."""
         """
         if not text:
             return {}
-        
+
+        # Input degenere: nessun token estraibile, evita la chiamata LLM
+        if len(text.strip()) < 20 or not _EXTRACTABLE_RE.search(text):
+            return {category: [] for category in _ENTITY_CATEGORIES}
+
         prompt = """Estrai le seguenti entità dal testo:
 
 1. PERSONE: Nomi di persone menzionate
@@ -239,60 +394,74 @@ Rispondi in formato JSON."""
 
 Rispondi in JSON con queste chiavi: persons, organizations, locations, dates, numbers, concepts"""
 
-        response = await self.invoke_llm(prompt, text[:5000])
-        
-        try:
-            import re
-            json_match = re.search(r'\{[\s\S]*\}', response)
-            if json_match:
-                return json.loads(json_match.group())
-        except json.JSONDecodeError:
-            pass
-        
-        return {
-            "persons": [],
-            "organizations": [],
-            "locations": [],
-            "dates": [],
-            "numbers": [],
-            "concepts": [],
-            "raw": response
-        }
-    
+        response = await self.invoke_llm_json(prompt, text[:5000])
+
+        block = extract_json_block(response)
+        if block:
+            try:
+                return normalize_entity_categories(json_loads(block))
+            except ValueError:
+                pass
+
+        result: Dict[str, Any] = {category: [] for category in _ENTITY_CATEGORIES}
+        result["raw"] = response
+        return result
+
+    async def extract_entities_batch(self, texts: List[str]) -> List[Dict[str, List[str]]]:
+        """
+        Estrae entità da più testi in parallelo.
+
+        Args:
+            texts: Lista di testi indipendenti
+
+        Returns:
+            Lista di risultati, uno per testo (stesso ordine)
+        """
+        if not texts:
+            return []
+
+        return list(await asyncio.gather(
+            *(self.extract_entities(t) for t in texts)
+        ))
+
     async def fact_check(
         self,
         claims: List[str],
-        sources: List[Dict]
+        sources: List[Dict],
+        batch_size: int = 5
     ) -> Dict[str, Any]:
         """
         Verifica coerenza tra affermazioni e fonti.
-        
+
+        I claim vengono raggruppati in micro-batch: un prompt per claim
+        paga l'overhead per-richiesta, un prompt unico con decine di
+        claim degrada la qualità del modello. I micro-batch sono
+        eseguiti in parallelo via batch_invoke_llm.
+
         Args:
             claims: Lista di affermazioni da verificare
             sources: Lista di fonti con testo
-            
+            batch_size: Claim per micro-batch
+
         Returns:
-            Risultato verifica per ogni claim
+            Risultato verifica per ogni claim (array "verifications")
         """
         if not claims:
             return {"error": "Nessuna affermazione da verificare"}
-        
-        # Prepara contesto fonti
-        sources_text = []
-        for i, s in enumerate(sources[:5], 1):
-            title = s.get("title", f"Fonte {i}")
-            content = s.get("content", s.get("snippet", ""))[:500]
-            sources_text.append(f"[{i}] {title}: {content}")
-        
-        sources_context = "\n\n".join(sources_text)
-        
-        # Prepara claims
-        claims_text = "\n".join(f"- {c}" for c in claims)
-        
-        prompt = f"""Verifica queste affermazioni rispetto alle fonti fornite:
+
+        # Prepara contesto fonti (memoizzato sul contenuto)
+        sources_context = _format_sources(tuple(
+            (
+                s.get("title", f"Fonte {i}"),
+                s.get("content", s.get("snippet", ""))[:500]
+            )
+            for i, s in enumerate(sources[:5], 1)
+        ))
+
+        prompt_template = """Verifica queste affermazioni rispetto alle fonti fornite:
 
 AFFERMAZIONI:
-{claims_text}
+{claims_block}
 
 Per ogni affermazione indica:
 - SUPPORTATA: La fonte conferma
@@ -301,19 +470,52 @@ Per ogni affermazione indica:
 - PARZIALE: Parzialmente supportata
 
 Fornisci anche spiegazione e riferimento alla fonte.
-Rispondi in JSON con array "verifications"."""
+Rispondi in JSON con array "verifications": un elemento per
+affermazione, nello stesso ordine, con chiavi "verdict",
+"explanation", "source_ref"."""
 
-        response = await self.invoke_llm(prompt, sources_context)
-        
-        try:
-            import re
-            json_match = re.search(r'\{[\s\S]*\}', response)
-            if json_match:
-                return json.loads(json_match.group())
-        except json.JSONDecodeError:
-            pass
-        
-        return {"raw_verification": response}
+        batches = [
+            claims[i:i + batch_size]
+            for i in range(0, len(claims), batch_size)
+        ]
+
+        responses = await self.batch_invoke_llm([
+            (
+                prompt_template.format(claims_block="\n".join(
+                    f"{i}. {claim}" for i, claim in enumerate(batch, 1)
+                )),
+                sources_context
+            )
+            for batch in batches
+        ], json_mode=True)
+
+        # Merge: riallinea le verifiche di ogni micro-batch ai claim
+        verifications = []
+        for batch, response in zip(batches, responses):
+            parsed = self._parse_json_response(response)
+            batch_verifications = parsed.get("verifications")
+            if not isinstance(batch_verifications, list):
+                batch_verifications = [parsed for _ in batch]
+            # zip_longest: se il modello restituisce meno verifiche dei
+            # claim, i claim di coda ricevono un placeholder invece di
+            # sparire in silenzio dal report
+            for claim, verification in zip_longest(batch, batch_verifications):
+                if claim is None:
+                    break  # verifiche in eccesso, nessun claim da legare
+                if verification is None:
+                    verification = {
+                        "claim": claim,
+                        "verdict": "NON VERIFICABILE",
+                        "explanation": "nessuna verifica restituita dal modello"
+                    }
+                elif isinstance(verification, dict):
+                    verification = dict(verification)
+                    verification["claim"] = claim
+                else:
+                    verification = {"claim": claim, "raw_verification": verification}
+                verifications.append(verification)
+
+        return {"verifications": verifications}
     
     async def analyze_research_results(self, data: Dict) -> Dict[str, Any]:
         """
@@ -332,32 +534,77 @@ Rispondi in JSON con array "verifications"."""
         news_results = data.get("news_results", [])
         deep_content = data.get("deep_content", [])
         topic = data.get("topic", "Non specificato")
-        
-        # Prepara contesto
+
+        # Nessuna fonte: inutile pagare la latenza del LLM
+        if not web_results and not news_results and not deep_content:
+            return {
+                "summary": "Nessun risultato da analizzare",
+                "sources_analyzed": {"web": 0, "news": 0, "deep": 0},
+                "analyzed_at": datetime.now().isoformat()
+            }
+
+        # Dedup per URL, poi preparazione per-fonte in parallelo su thread
+        # (il troncamento token-aware non blocca così l'event loop)
+        seen_sources = set()
+
+        def _unique(items: List[Dict], limit: int, *url_keys: str) -> List[Dict]:
+            unique = []
+            for item in items[:limit]:
+                key = item.get("title", "")
+                for url_key in url_keys:
+                    if item.get(url_key):
+                        key = item[url_key]
+                        break
+                key = key.casefold()
+                if key not in seen_sources:
+                    seen_sources.add(key)
+                    unique.append(item)
+            return unique
+
+        unique_web = _unique(web_results, ANALYSIS_MAX_WEB_SOURCES, "href", "link")
+        unique_news = _unique(news_results, ANALYSIS_MAX_NEWS_SOURCES, "url", "link")
+        unique_deep = deep_content[:ANALYSIS_MAX_DEEP_SOURCES]
+
+        prepared = await asyncio.gather(
+            *(asyncio.to_thread(_prep_source, r, "web") for r in unique_web),
+            *(asyncio.to_thread(_prep_source, r, "news") for r in unique_news),
+            *(asyncio.to_thread(_prep_source, d, "deep") for d in unique_deep)
+        )
+        web_lines = prepared[:len(unique_web)]
+        news_lines = prepared[len(unique_web):len(unique_web) + len(unique_news)]
+        deep_lines = prepared[len(unique_web) + len(unique_news):]
+
+        # Assembla rispettando il budget di token complessivo
+        context_budget = 3000  # token complessivi per il contesto
         context_parts = [f"Topic di ricerca: {topic}\n"]
-        
-        # Web results
+        used_tokens = count_tokens(context_parts[0])
+
+        def _append_within_budget(part: str) -> bool:
+            nonlocal used_tokens
+            part_tokens = count_tokens(part)
+            if used_tokens + part_tokens > context_budget:
+                return False
+            context_parts.append(part)
+            used_tokens += part_tokens
+            return True
+
         context_parts.append("## Risultati Web:")
-        for r in web_results[:5]:
-            title = r.get("title", "")
-            snippet = r.get("body", r.get("snippet", ""))[:200]
-            context_parts.append(f"- {title}: {snippet}")
-        
-        # News
-        if news_results:
+        for line in web_lines:
+            if not _append_within_budget(line):
+                break
+
+        if news_lines:
             context_parts.append("\n## News Recenti:")
-            for r in news_results[:3]:
-                title = r.get("title", "")
-                source = r.get("source", "")
-                context_parts.append(f"- [{source}] {title}")
-        
-        # Deep content
-        if deep_content:
+            for line in news_lines:
+                if not _append_within_budget(line):
+                    break
+
+        if deep_lines:
             context_parts.append("\n## Contenuti Approfonditi:")
-            for d in deep_content[:2]:
-                content = d.get("content", "")[:1000]
-                context_parts.append(f"---\n{content}\n---")
-        
+            for line in deep_lines:
+                if not _append_within_budget(line):
+                    break
+
         context = "\n".join(context_parts)
         
         prompt = """Analizza questi risultati di ricerca e fornisci:
@@ -371,18 +618,10 @@ Rispondi in JSON con array "verifications"."""
 
 Rispondi in JSON."""
 
-        response = await self.invoke_llm(prompt, context)
-        
-        try:
-            import re
-            json_match = re.search(r'\{[\s\S]*\}', response)
-            if json_match:
-                analysis = json.loads(json_match.group())
-            else:
-                analysis = {"raw_analysis": response}
-        except json.JSONDecodeError:
-            analysis = {"raw_analysis": response}
-        
+        response = await self.invoke_llm_json(prompt, context)
+
+        analysis = self._parse_json_response(response)
+
         # Aggiungi metadata
         analysis["sources_analyzed"] = {
             "web": len(web_results),
@@ -6,8 +6,12 @@ con gli LLM locali (Ollama).
 """
 
 import asyncio
+import hashlib
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from collections import defaultdict, deque
+from functools import lru_cache
+from typing import Any, Deque, Dict, List, Optional
 from datetime import datetime
 from enum import Enum
 from dataclasses import dataclass, field
@@ -16,9 +20,72 @@ from langchain_ollama import ChatOllama
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 from langchain_core.prompts import ChatPromptTemplate
 
-import sys
-sys.path.append("..")
-from config import get_llm_config, VERBOSE
+from config import (
+    get_llm_config,
+    VERBOSE,
+    CACHE_DIR,
+    EMBEDDING_MODEL,
+    HISTORY_MAX,
+    PERSIST_MESSAGE_LOG,
+    MESSAGE_LOG_DIR,
+    SEMANTIC_CACHE,
+    SEMANTIC_CACHE_THRESHOLD,
+    SEMANTIC_CACHE_TTL
+)
+from utils.fastjson import json_dumps, json_loads
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+# Configurazione LLM letta una sola volta a import time
+_LLM_CFG = get_llm_config()
+
+
+# Cache su disco per le risposte LLM, indirizzata per contenuto:
+# chiave = hash di (system_prompt, contesto, messaggio, modello)
+_LLM_CACHE_DIR = CACHE_DIR / "llm"
+
+
+# Cache semantica opzionale: secondo livello dopo la cache esatta,
+# serve risposte già generate per prompt *simili* (vedi config)
+_semantic_cache = None
+
+
+def _get_semantic_cache():
+    """Istanza condivisa della cache semantica (None se disattivata)."""
+    global _semantic_cache
+    if not SEMANTIC_CACHE:
+        return None
+    if _semantic_cache is None:
+        from utils.semantic_cache import SemanticCache
+        _semantic_cache = SemanticCache(
+            cache_dir=CACHE_DIR,
+            model_name=EMBEDDING_MODEL,
+            threshold=SEMANTIC_CACHE_THRESHOLD,
+            ttl=SEMANTIC_CACHE_TTL
+        )
+    return _semantic_cache if _semantic_cache.available else None
+
+
+@lru_cache(maxsize=None)
+def _get_chat_ollama(model: str, base_url: str, temperature: float) -> ChatOllama:
+    """
+    Client ChatOllama condiviso per configurazione identica.
+
+    Un client per (model, base_url, temperature) evita pool di
+    connessioni e warmup duplicati quando più agenti puntano allo
+    stesso server Ollama. ChatOllama è stateless tra le chiamate.
+    """
+    return ChatOllama(model=model, base_url=base_url, temperature=temperature)
+
+
+def _hms() -> str:
+    """Ora corrente in formato HH:MM:SS, senza passare da strftime."""
+    t = time.localtime()
+    return f"{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}"
 
 
 # =============================================================================
@@ -34,7 +101,7 @@ class MessageType(str, Enum):
     HANDOFF = "handoff"         # Passaggio di contesto ad altro agente
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentMessage:
     """
     Messaggio scambiato tra agenti (protocollo A2A).
@@ -62,6 +129,10 @@ class AgentMessage:
             "metadata": self.metadata
         }
     
+    def to_json(self) -> str:
+        """Serializza il messaggio in JSON (orjson quando disponibile)."""
+        return json_dumps(self.to_dict())
+
     @classmethod
     def from_dict(cls, data: dict) -> "AgentMessage":
         """Deserializza un messaggio."""
@@ -76,7 +147,7 @@ class AgentMessage:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentCapability:
     """Descrive una capacità di un agente."""
     name: str                    # Nome della capacità
@@ -98,8 +169,25 @@ class BaseAgent(ABC):
     - Protocollo di comunicazione A2A
     - Logging e debugging
     - Gestione errori
+
+    Nota: la classe usa __slots__ per ridurre la memoria per istanza;
+    le sottoclassi che aggiungono attributi devono dichiarare i propri
+    __slots__ (o rinunciare al risparmio accettando il __dict__).
     """
-    
+
+    __slots__ = (
+        "agent_id",
+        "name",
+        "description",
+        "system_prompt",
+        "model_name",
+        "llm",
+        "message_history",
+        "is_active",
+        "_capabilities",
+        "_msglog",
+    )
+
     def __init__(
         self,
         agent_id: str,
@@ -123,21 +211,30 @@ class BaseAgent(ABC):
         self.description = description
         self.system_prompt = system_prompt
         
-        # Configurazione LLM
-        llm_config = get_llm_config()
-        self.model_name = model or llm_config["model"]
-        
-        # Inizializza LLM
-        self.llm = ChatOllama(
-            model=self.model_name,
-            base_url=llm_config["base_url"],
-            temperature=llm_config["temperature"]
+        # Configurazione LLM (singleton di modulo)
+        self.model_name = model or _LLM_CFG["model"]
+
+        # Inizializza LLM (client condiviso tra agenti con pari config)
+        self.llm = _get_chat_ollama(
+            self.model_name,
+            _LLM_CFG["base_url"],
+            _LLM_CFG["temperature"]
         )
         
-        # Stato interno
-        self.message_history: List[AgentMessage] = []
+        # Stato interno (ring buffer: memoria limitata anche su run lunghi)
+        self.message_history: Deque[AgentMessage] = deque(maxlen=HISTORY_MAX)
         self.is_active = False
         self._capabilities: List[AgentCapability] = []
+
+        # Log binario append-only dei messaggi (opzionale): la history
+        # completa vive su disco, in RAM resta solo la finestra calda
+        self._msglog = None
+        if PERSIST_MESSAGE_LOG:
+            MESSAGE_LOG_DIR.mkdir(parents=True, exist_ok=True)
+            suffix = "msgpack" if msgpack is not None else "ndjson"
+            self._msglog = open(
+                MESSAGE_LOG_DIR / f"{agent_id}.{suffix}", "ab"
+            )
         
     # -------------------------------------------------------------------------
     # Abstract Methods (da implementare nelle sottoclassi)
@@ -163,54 +260,244 @@ class BaseAgent(ABC):
         pass
     
     @abstractmethod
+    def _build_capabilities(self) -> List[AgentCapability]:
+        """
+        Costruisce la lista delle capacità dell'agente.
+
+        Chiamato una sola volta: il risultato viene memorizzato da
+        get_capabilities().
+        """
+        pass
+
     def get_capabilities(self) -> List[AgentCapability]:
         """
-        Restituisce le capacità dell'agente.
-        
+        Restituisce le capacità dell'agente (memoizzate).
+
         Usato per discovery e routing delle richieste.
         """
-        pass
+        if not self._capabilities:
+            self._capabilities = self._build_capabilities()
+        return self._capabilities
     
     # -------------------------------------------------------------------------
     # Core Methods
     # -------------------------------------------------------------------------
     
+    def _llm_cache_key(self, user_message: str, context: Optional[str]) -> str:
+        """Chiave content-addressed per la cache delle risposte LLM."""
+        payload = "|".join([
+            self.system_prompt,
+            context or "",
+            user_message,
+            self.model_name
+        ])
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
     async def invoke_llm(
         self,
         user_message: str,
-        context: Optional[str] = None
+        context: Optional[str] = None,
+        use_cache: bool = True
     ) -> str:
         """
         Invoca il LLM con un messaggio.
-        
+
+        Le risposte vengono salvate in una cache su disco: invocazioni
+        ripetute sullo stesso (prompt, contesto, modello) evitano il
+        round-trip verso Ollama.
+
         Args:
             user_message: Messaggio/domanda dell'utente
             context: Contesto aggiuntivo opzionale
-            
+            use_cache: Se True, riusa risposte già calcolate
+
         Returns:
             Risposta del LLM
         """
+        cache_path = _LLM_CACHE_DIR / f"{self._llm_cache_key(user_message, context)}.txt"
+
+        if use_cache and cache_path.exists():
+            if VERBOSE:
+                print(f"[{self.name}] Risposta LLM dalla cache")
+            return cache_path.read_text(encoding="utf-8")
+
+        # Secondo livello: cache semantica (prompt simili, non identici)
+        semantic = _get_semantic_cache() if use_cache else None
+        semantic_key = f"{user_message}\n{(context or '')[:2000]}"
+        if semantic is not None:
+            hit = await asyncio.to_thread(semantic.get, semantic_key)
+            if hit is not None:
+                if VERBOSE:
+                    print(f"[{self.name}] Risposta LLM dalla cache semantica")
+                return hit
+
         messages = [
             SystemMessage(content=self.system_prompt)
         ]
-        
+
         if context:
             messages.append(HumanMessage(content=f"Contesto:\n{context}"))
-        
+
         messages.append(HumanMessage(content=user_message))
-        
+
         if VERBOSE:
             print(f"[{self.name}] Invocando LLM...")
-        
+
         try:
             response = await self.llm.ainvoke(messages)
-            return response.content
         except Exception as e:
             error_msg = f"Errore LLM: {str(e)}"
             if VERBOSE:
                 print(f"[{self.name}] {error_msg}")
             return error_msg
+
+        # Scritture cache best-effort: un errore qui (disco pieno,
+        # permessi) non deve buttare via una risposta già ottenuta
+        try:
+            if use_cache:
+                _LLM_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                cache_path.write_text(response.content, encoding="utf-8")
+            if semantic is not None:
+                await asyncio.to_thread(semantic.put, semantic_key, response.content)
+        except Exception as e:
+            if VERBOSE:
+                print(f"[{self.name}] Scrittura cache fallita: {e}")
+
+        return response.content
     
+    async def invoke_llm_json(
+        self,
+        user_message: str,
+        context: Optional[str] = None,
+        use_cache: bool = True
+    ) -> str:
+        """
+        Invoca il LLM in streaming, fermandosi al primo blocco JSON completo.
+
+        Molti metodi parsano un solo oggetto JSON e scartano i token
+        successivi (post-scriptum del modello): interrompere lo stream
+        quando la profondità delle parentesi torna a zero evita di
+        pagare la generazione dei token inutili.
+
+        Args:
+            user_message: Messaggio/domanda dell'utente
+            context: Contesto aggiuntivo opzionale
+            use_cache: Se True, riusa risposte già calcolate
+
+        Returns:
+            Testo generato fino alla chiusura del JSON (o completo se
+            nessun blocco JSON viene chiuso prima di EOF)
+        """
+        cache_path = _LLM_CACHE_DIR / (
+            f"{self._llm_cache_key(user_message, context)}-json.txt"
+        )
+
+        if use_cache and cache_path.exists():
+            if VERBOSE:
+                print(f"[{self.name}] Risposta LLM dalla cache")
+            return cache_path.read_text(encoding="utf-8")
+
+        messages = [
+            SystemMessage(content=self.system_prompt)
+        ]
+
+        if context:
+            messages.append(HumanMessage(content=f"Contesto:\n{context}"))
+
+        messages.append(HumanMessage(content=user_message))
+
+        if VERBOSE:
+            print(f"[{self.name}] Invocando LLM (streaming JSON)...")
+
+        # Scanner incrementale: profondità parentesi, stato stringa/escape
+        parts: List[str] = []
+        depth = 0
+        started = False
+        in_string = False
+        escaped = False
+        done = False
+
+        try:
+            async for chunk in self.llm.astream(messages):
+                token = chunk.content
+                if not token:
+                    continue
+                parts.append(token)
+
+                for c in token:
+                    if in_string:
+                        if escaped:
+                            escaped = False
+                        elif c == "\\":
+                            escaped = True
+                        elif c == '"':
+                            in_string = False
+                    elif c == '"' and started:
+                        in_string = True
+                    elif c == "{":
+                        depth += 1
+                        started = True
+                    elif c == "}" and started:
+                        depth -= 1
+                        if depth == 0:
+                            done = True
+                            break
+
+                if done:
+                    break  # chiude il generatore e abortisce lo stream
+
+        except Exception as e:
+            error_msg = f"Errore LLM: {str(e)}"
+            if VERBOSE:
+                print(f"[{self.name}] {error_msg}")
+            return error_msg
+
+        response = "".join(parts)
+
+        # Scrittura cache best-effort: un errore qui non deve buttare
+        # via la risposta già streamata
+        if use_cache:
+            try:
+                _LLM_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                cache_path.write_text(response, encoding="utf-8")
+            except Exception as e:
+                if VERBOSE:
+                    print(f"[{self.name}] Scrittura cache fallita: {e}")
+
+        return response
+
+    async def batch_invoke_llm(
+        self,
+        prompts: List[tuple],
+        concurrency: int = 8,
+        json_mode: bool = False
+    ) -> List[str]:
+        """
+        Invoca il LLM su più prompt indipendenti in parallelo.
+
+        Ollama gestisce richieste concorrenti, quindi sovrapporre le
+        chiamate sull'event loop nasconde la latenza per-richiesta
+        (speedup quasi lineare fino al limite di concorrenza).
+
+        Args:
+            prompts: Lista di tuple (user_message, context) indipendenti
+            concurrency: Numero massimo di richieste simultanee
+            json_mode: Se True, usa invoke_llm_json (early-exit sul JSON)
+
+        Returns:
+            Lista di risposte, nello stesso ordine dei prompt
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        invoke = self.invoke_llm_json if json_mode else self.invoke_llm
+
+        async def _guarded(user_message: str, context: Optional[str]) -> str:
+            async with semaphore:
+                return await invoke(user_message, context)
+
+        return list(await asyncio.gather(
+            *(_guarded(user_message, context) for user_message, context in prompts)
+        ))
+
     def create_message(
         self,
         receiver: str,
@@ -239,9 +526,15 @@ class BaseAgent(ABC):
             metadata={"agent_name": self.name}
         )
         
-        # Salva nella history
+        # Salva nella history (e nel log persistente, se attivo)
         self.message_history.append(message)
-        
+        if self._msglog is not None:
+            record = message.to_dict()
+            if msgpack is not None:
+                self._msglog.write(msgpack.packb(record, use_bin_type=True))
+            else:
+                self._msglog.write((json_dumps(record) + "\n").encode("utf-8"))
+
         return message
     
     def create_response(
@@ -307,8 +600,7 @@ class BaseAgent(ABC):
     def log(self, message: str, level: str = "INFO"):
         """Logging con prefisso agente."""
         if VERBOSE or level in ["ERROR", "WARNING"]:
-            timestamp = datetime.now().strftime("%H:%M:%S")
-            print(f"[{timestamp}] [{self.name}] [{level}] {message}")
+            print(f"[{_hms()}] [{self.name}] [{level}] {message}")
     
     def get_stats(self) -> Dict[str, Any]:
         """Restituisce statistiche dell'agente."""
@@ -341,31 +633,37 @@ class AgentRegistry:
     
     def __init__(self):
         self._agents: Dict[str, BaseAgent] = {}
-    
+        # Indice inverso capacità -> agenti, mantenuto a register/unregister
+        self._by_capability: Dict[str, List[BaseAgent]] = defaultdict(list)
+
     def register(self, agent: BaseAgent):
         """Registra un agente."""
+        if agent.agent_id in self._agents:
+            # Ri-registrazione: rimuovi il vecchio agente dall'indice
+            self.unregister(agent.agent_id)
         self._agents[agent.agent_id] = agent
+        for cap in agent.get_capabilities():
+            self._by_capability[cap.name].append(agent)
         if VERBOSE:
             print(f"[Registry] Registrato agente: {agent.name}")
-    
+
     def unregister(self, agent_id: str):
         """Rimuove un agente."""
-        if agent_id in self._agents:
-            del self._agents[agent_id]
-    
+        agent = self._agents.pop(agent_id, None)
+        if agent is None:
+            return
+        for cap in agent.get_capabilities():
+            agents = self._by_capability.get(cap.name)
+            if agents and agent in agents:
+                agents.remove(agent)
+
     def get(self, agent_id: str) -> Optional[BaseAgent]:
         """Ottiene un agente per ID."""
         return self._agents.get(agent_id)
-    
+
     def find_by_capability(self, capability_name: str) -> List[BaseAgent]:
-        """Trova agenti che hanno una specifica capacità."""
-        result = []
-        for agent in self._agents.values():
-            for cap in agent.get_capabilities():
-                if cap.name == capability_name:
-                    result.append(agent)
-                    break
-        return result
+        """Trova agenti che hanno una specifica capacità (lookup O(1))."""
+        return list(self._by_capability.get(capability_name, ()))
     
     def list_all(self) -> List[BaseAgent]:
         """Lista tutti gli agenti registrati."""
@@ -387,6 +685,29 @@ class AgentRegistry:
         return None
 
 
+def iter_message_log(agent_id: str):
+    """
+    Rilegge il log messaggi persistito di un agente.
+
+    Yields:
+        Dizionari messaggio (stesso formato di AgentMessage.to_dict)
+    """
+    if msgpack is not None:
+        path = MESSAGE_LOG_DIR / f"{agent_id}.msgpack"
+        if path.exists():
+            with open(path, "rb") as f:
+                unpacker = msgpack.Unpacker(f, raw=False)
+                yield from unpacker
+            return
+
+    path = MESSAGE_LOG_DIR / f"{agent_id}.ndjson"
+    if path.exists():
+        with open(path, "rb") as f:
+            for line in f:
+                if line.strip():
+                    yield json_loads(line)
+
+
 # Singleton registry
 _registry: Optional[AgentRegistry] = None
 
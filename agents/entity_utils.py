@@ -0,0 +1,115 @@
+"""
+Utility per il post-processing delle entità estratte.
+
+Deduplica e normalizza le liste di entità restituite dal LLM
+(persone, organizzazioni, numeri, ...). Su liste grandi, se numba e
+numpy sono disponibili, la dedup usa una routine JIT-compilata su
+fingerprint uint64; altrimenti si usa il fallback puro Python con set().
+"""
+
+from typing import Any, Dict, List
+
+try:
+    import numba
+    import numpy as np
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
+
+
+# Soglia sotto cui il fallback con set() è comunque più veloce del
+# round-trip verso numpy/numba
+_JIT_THRESHOLD = 64
+
+# Costanti FNV-1a a 64 bit
+_FNV_OFFSET = 0xcbf29ce484222325
+_FNV_PRIME = 0x100000001b3
+_U64_MASK = 0xFFFFFFFFFFFFFFFF
+
+
+def _fnv1a_64(s: str) -> int:
+    """Fingerprint FNV-1a a 64 bit di una stringa."""
+    h = _FNV_OFFSET
+    for byte in s.encode("utf-8"):
+        h = ((h ^ byte) * _FNV_PRIME) & _U64_MASK
+    return h
+
+
+if _HAS_NUMBA:
+
+    @numba.njit(cache=True)
+    def _first_occurrence_mask(hashes):
+        """
+        Maschera booleana della prima occorrenza di ogni hash.
+
+        Ordinamento stabile + scan lineare sulle run di valori uguali:
+        il loop stretto gira compilato, senza overhead dell'interprete.
+        """
+        n = hashes.shape[0]
+        keep = np.zeros(n, dtype=np.bool_)
+        order = np.argsort(hashes, kind="mergesort")
+        i = 0
+        while i < n:
+            j = i
+            while j + 1 < n and hashes[order[j + 1]] == hashes[order[i]]:
+                j += 1
+            # La prima occorrenza nell'ordine originale è il minimo indice
+            first = order[i]
+            for k in range(i + 1, j + 1):
+                if order[k] < first:
+                    first = order[k]
+            keep[first] = True
+            i = j + 1
+        return keep
+
+
+def dedup_entities(values: List[str]) -> List[str]:
+    """
+    Deduplica una lista di entità preservando l'ordine.
+
+    Il confronto è case-insensitive; la prima occorrenza vince.
+
+    Args:
+        values: Lista di entità potenzialmente duplicate; gli scalari
+            non stringa (il LLM restituisce spesso numeri e date come
+            numeri JSON) vengono coerciti con str()
+
+    Returns:
+        Lista senza duplicati, nell'ordine originale
+    """
+    cleaned = []
+    for v in values:
+        if v is None:
+            continue
+        s = v.strip() if isinstance(v, str) else str(v).strip()
+        if s:
+            cleaned.append(s)
+
+    if _HAS_NUMBA and len(cleaned) >= _JIT_THRESHOLD:
+        hashes = np.array(
+            [_fnv1a_64(v.casefold()) for v in cleaned], dtype=np.uint64
+        )
+        keep = _first_occurrence_mask(hashes)
+        return [v for v, k in zip(cleaned, keep) if k]
+
+    seen = set()
+    result = []
+    for v in cleaned:
+        key = v.casefold()
+        if key not in seen:
+            seen.add(key)
+            result.append(v)
+    return result
+
+
+def normalize_entity_categories(entities: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Normalizza un dizionario di categorie di entità.
+
+    Applica dedup_entities a ogni valore che sia una lista di stringhe,
+    lasciando intatti gli altri campi (es. "raw").
+    """
+    return {
+        key: dedup_entities(value) if isinstance(value, list) else value
+        for key, value in entities.items()
+    }
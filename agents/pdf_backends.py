@@ -0,0 +1,90 @@
+"""
+Backend per l'estrazione di testo da PDF.
+
+Preferisce pypdfium2 (binding FFI a PDFium, C++), poi crapdf (binding
+Rust a lopdf), con fallback sul puro Python pypdf. I backend nativi
+estraggono 2-3x più velocemente; la scelta avviene al primo uso e vale
+per tutto il processo (anche nei worker del process pool).
+"""
+
+from typing import Optional
+
+_backend: Optional[str] = None
+
+
+def active_backend() -> str:
+    """Rileva (una volta sola) il backend PDF disponibile."""
+    global _backend
+    if _backend is None:
+        try:
+            import pypdfium2  # noqa: F401
+            _backend = "pypdfium2"
+        except ImportError:
+            try:
+                import crapdf  # noqa: F401
+                _backend = "crapdf"
+            except ImportError:
+                _backend = "pypdf"
+    return _backend
+
+
+def page_count(path: str) -> int:
+    """Numero di pagine del PDF."""
+    backend = active_backend()
+
+    if backend == "pypdfium2":
+        import pypdfium2 as pdfium
+        doc = pdfium.PdfDocument(path)
+        try:
+            return len(doc)
+        finally:
+            doc.close()
+
+    if backend == "crapdf":
+        from crapdf import extract
+        return len(extract(path))
+
+    from pypdf import PdfReader
+    return len(PdfReader(path).pages)
+
+
+def extract_pages(path: str, start: int, end: int) -> str:
+    """
+    Estrae il testo delle pagine [start, end) di un PDF.
+
+    Args:
+        path: Percorso del file PDF
+        start: Prima pagina (0-based, inclusa)
+        end: Ultima pagina (esclusa)
+
+    Returns:
+        Testo estratto, una pagina per riga
+    """
+    backend = active_backend()
+
+    if backend == "pypdfium2":
+        import pypdfium2 as pdfium
+        doc = pdfium.PdfDocument(path)
+        try:
+            return "\n".join(
+                doc[i].get_textpage().get_text_range()
+                for i in range(start, min(end, len(doc)))
+            )
+        finally:
+            doc.close()
+
+    if backend == "crapdf":
+        from crapdf import extract
+        return "\n".join(extract(path)[start:end])
+
+    from pypdf import PdfReader
+    reader = PdfReader(path)
+    return "\n".join(
+        reader.pages[i].extract_text() or ""
+        for i in range(start, min(end, len(reader.pages)))
+    )
+
+
+def extract_pdf_text(path: str) -> str:
+    """Estrae il testo completo di un PDF col backend migliore."""
+    return extract_pages(path, 0, page_count(path))
@@ -9,18 +9,29 @@ Responsabilità:
 """
 
 import asyncio
-import json
+import hashlib
+import time
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Any, Dict, List, Optional
 from datetime import datetime
+from urllib.parse import urlsplit, urlunsplit
 
+from ._context_utils import build_snippet_block
+from ._json_utils import extract_json_async
 from .base_agent import (
-    BaseAgent, 
-    AgentMessage, 
-    MessageType, 
+    BaseAgent,
+    AgentMessage,
+    MessageType,
     AgentCapability,
     get_registry
 )
 
+from utils.fastjson import json_dumps, json_loads
+from utils.token_budget import fit
+
+from config import CACHE_DIR, WEB_CACHE_TTL
+
 
 RESEARCH_AGENT_PROMPT = """Sei un Research Agent specializzato nella ricerca di informazioni.
 
@@ -40,9 +51,127 @@ Rispondi in italiano. Sii conciso ma completo.
 """
 
 
+# =============================================================================
+# Cache TTL per ricerche e fetch
+# =============================================================================
+# Le query DDGS e i fetch di pagine stabili sono funzioni pure dei loro
+# argomenti per finestre brevi: un hit evita l'intero round-trip di rete.
+# Cache a due livelli: LRU in memoria + file su disco (sopravvive ai
+# riavvii del processo), stessa impostazione della cache LLM di BaseAgent.
+
+_WEB_CACHE_DIR = CACHE_DIR / "web"
+_WEB_CACHE_MAX = 1024
+
+_web_cache: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+
+
+def _cache_key(*parts: Any) -> str:
+    """Chiave content-addressed per una richiesta web."""
+    raw = "|".join(str(p) for p in parts)
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _cache_get(key: str) -> Optional[Any]:
+    """Cerca in memoria, poi su disco. None se assente o scaduto."""
+    now = time.time()
+
+    entry = _web_cache.get(key)
+    if entry is not None:
+        expires, value = entry
+        if now < expires:
+            _web_cache.move_to_end(key)
+            return value
+        del _web_cache[key]
+
+    cache_file = _WEB_CACHE_DIR / f"{key}.json"
+    try:
+        if cache_file.exists() and now - cache_file.stat().st_mtime < WEB_CACHE_TTL:
+            value = json_loads(cache_file.read_text(encoding="utf-8"))
+            _web_cache[key] = (now + WEB_CACHE_TTL, value)
+            return value
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _cache_put(key: str, value: Any) -> None:
+    """Inserisce in memoria (con eviction LRU) e su disco (best-effort)."""
+    _web_cache[key] = (time.time() + WEB_CACHE_TTL, value)
+    _web_cache.move_to_end(key)
+    while len(_web_cache) > _WEB_CACHE_MAX:
+        _web_cache.popitem(last=False)
+
+    try:
+        _WEB_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        (_WEB_CACHE_DIR / f"{key}.json").write_text(
+            json_dumps(value), encoding="utf-8"
+        )
+    except OSError:
+        pass
+
+
+# Byte massimi scaricati per pagina nel deep search (il testo estratto
+# è comunque troncato a valle)
+_FETCH_BYTE_BUDGET = 200_000
+
+
+@lru_cache(maxsize=None)
+def _get_bs4():
+    """
+    Accessor memoizzato per BeautifulSoup.
+
+    L'import resta pigro (non pesa sullo startup se il deep search non
+    viene mai usato) ma il lookup nel registro import — che prende il
+    lock globale — si paga una volta sola invece che a ogni pagina.
+    """
+    from bs4 import BeautifulSoup
+    return BeautifulSoup
+
+# Parametri di tracking ignorati nella normalizzazione degli URL
+_TRACKING_PREFIXES = ("utm_", "fbclid", "gclid", "mc_cid", "mc_eid")
+
+
+def _normalize_url(url: str) -> str:
+    """URL canonico per il dedup: niente fragment né parametri di tracking."""
+    parts = urlsplit(url)
+    query = "&".join(
+        p for p in parts.query.split("&")
+        if p and not p.startswith(_TRACKING_PREFIXES)
+    )
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, query, ""))
+
+
+def _dedup_by_url(items: List[Dict], *url_keys: str) -> List[Dict]:
+    """
+    Filtra i duplicati in un solo passaggio O(n), preservando l'ordine.
+
+    Args:
+        items: Risultati di ricerca
+        url_keys: Chiavi in cui cercare l'URL (la prima presente vince)
+
+    Returns:
+        Lista senza duplicati (per URL normalizzato)
+    """
+    seen: set = set()
+    unique: List[Dict] = []
+
+    for item in items:
+        url = next((item[k] for k in url_keys if item.get(k)), None)
+        key = _normalize_url(url) if url else None
+        if key is not None and key in seen:
+            continue
+        if key is not None:
+            seen.add(key)
+        unique.append(item)
+
+    return unique
+
+
 class ResearchAgent(BaseAgent):
     """Agente specializzato nella ricerca di informazioni."""
-    
+
+    __slots__ = ("_http", "_ddgs")
+
     def __init__(self, model: Optional[str] = None):
         super().__init__(
             agent_id="research_agent",
@@ -51,8 +180,60 @@ class ResearchAgent(BaseAgent):
             system_prompt=RESEARCH_AGENT_PROMPT,
             model=model
         )
+
+        # Client HTTP condiviso (creato pigramente al primo fetch):
+        # il pool keep-alive evita un handshake TCP+TLS per ogni URL
+        self._http = None
+
+        # Sessione DDGS condivisa per la vita dell'agente: costruirne
+        # una per chiamata ricrea ogni volta client e cookie jar interni
+        self._ddgs = None
+
+    def _get_ddgs(self):
+        """Restituisce la sessione DDGS condivisa, creandola al primo uso."""
+        from ddgs import DDGS
+
+        if self._ddgs is None:
+            self._ddgs = DDGS()
+        return self._ddgs
+
+    def _get_http(self):
+        """Restituisce il client HTTP condiviso, creandolo al primo uso."""
+        import httpx
+
+        from config import (
+            HTTP_MAX_CONNECTIONS,
+            HTTP_MAX_KEEPALIVE,
+            HTTP_KEEPALIVE_EXPIRY,
+            HTTP_POOL_TIMEOUT,
+            WEB_TIMEOUT
+        )
+
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+                    keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+                ),
+                timeout=httpx.Timeout(WEB_TIMEOUT, pool=HTTP_POOL_TIMEOUT),
+                follow_redirects=True
+            )
+        return self._http
+
+    async def close(self) -> None:
+        """Chiude client HTTP e sessione DDGS (da chiamare allo shutdown)."""
+        if self._http is not None and not self._http.is_closed:
+            await self._http.aclose()
+
+        if self._ddgs is not None:
+            try:
+                self._ddgs.__exit__(None, None, None)
+            except Exception:
+                pass
+            self._ddgs = None
     
-    def get_capabilities(self) -> List[AgentCapability]:
+    def _build_capabilities(self) -> List[AgentCapability]:
         return [
             AgentCapability(
                 name="web_search",
@@ -97,45 +278,135 @@ class ResearchAgent(BaseAgent):
     
     async def _web_search(self, query: str, max_results: int = 10) -> List[Dict]:
         """Esegue ricerca web via DuckDuckGo."""
-        from ddgs import DDGS
-        
+        key = _cache_key("text", query, max_results)
+        cached = _cache_get(key)
+        if cached is not None:
+            return cached
+
         try:
-            with DDGS() as ddgs:
-                results = list(ddgs.text(query, max_results=max_results))
+            ddgs = self._get_ddgs()
+            # DDGS è sincrono: eseguito in thread per non bloccare il loop
+            results = await asyncio.to_thread(
+                lambda: list(ddgs.text(query, max_results=max_results))
+            )
+            if results:
+                _cache_put(key, results)
             return results
         except Exception as e:
             self.log(f"Errore web search: {e}", "ERROR")
             return []
-    
+
+    async def _multi_web_search(self, queries: List[str], max_results: int = 10) -> List[List[Dict]]:
+        """
+        Esegue più query web condividendo una sola sessione DDGS.
+
+        Aprire un ``DDGS()`` per query paga ogni volta il setup del
+        client interno; qui il costo è ammortizzato sull'intero batch
+        (e si riduce il rischio di throttling per-IP). Le query già in
+        cache non toccano la rete.
+
+        Args:
+            queries: Lista di query da eseguire
+            max_results: Risultati massimi per query
+
+        Returns:
+            Una lista di risultati per ciascuna query, nello stesso ordine
+        """
+        batches: List[List[Dict]] = [[] for _ in queries]
+        pending = []
+
+        for i, query in enumerate(queries):
+            cached = _cache_get(_cache_key("text", query, max_results))
+            if cached is not None:
+                batches[i] = cached
+            else:
+                pending.append(i)
+
+        if pending:
+            try:
+                ddgs = self._get_ddgs()
+
+                def _run_batch() -> List[tuple]:
+                    # Tutto il batch in un solo salto di thread: DDGS è
+                    # sincrono e bloccherebbe il loop per ogni query
+                    return [
+                        (i, list(ddgs.text(queries[i], max_results=max_results)))
+                        for i in pending
+                    ]
+
+                for i, results in await asyncio.to_thread(_run_batch):
+                    batches[i] = results
+                    if results:
+                        _cache_put(_cache_key("text", queries[i], max_results), results)
+            except Exception as e:
+                self.log(f"Errore web search: {e}", "ERROR")
+
+        return batches
+
     async def _news_search(self, query: str, max_results: int = 10, timelimit: str = "w") -> List[Dict]:
         """Cerca news recenti."""
-        from ddgs import DDGS
-        
+        key = _cache_key("news", query, max_results, timelimit)
+        cached = _cache_get(key)
+        if cached is not None:
+            return cached
+
         try:
-            with DDGS() as ddgs:
-                results = list(ddgs.news(query, max_results=max_results, timelimit=timelimit))
+            ddgs = self._get_ddgs()
+            # DDGS è sincrono: eseguito in thread per non bloccare il loop
+            results = await asyncio.to_thread(
+                lambda: list(ddgs.news(query, max_results=max_results, timelimit=timelimit))
+            )
+            if results:
+                _cache_put(key, results)
             return results
         except Exception as e:
             self.log(f"Errore news search: {e}", "ERROR")
             return []
     
+    @staticmethod
+    def _extract_text(html: bytes) -> str:
+        """Estrae il testo utile da una pagina HTML (sincrono, CPU-bound).
+
+        Riceve i byte grezzi: BeautifulSoup rileva da sé la codifica
+        (meta charset, BOM, pattern di byte), così le pagine latin-1 o
+        cp1252 — frequenti sui siti italiani — non vengono alterate.
+        """
+        soup = _get_bs4()(html, "lxml")
+        for tag in soup(["script", "style", "nav", "footer", "header"]):
+            tag.decompose()
+
+        return soup.get_text(separator="\n", strip=True)[:10000]
+
     async def _fetch_page(self, url: str) -> str:
         """Recupera contenuto pagina web."""
-        import httpx
-        from bs4 import BeautifulSoup
-        
+        key = _cache_key("page", url)
+        cached = _cache_get(key)
+        if cached is not None:
+            return cached
+
         try:
-            async with httpx.AsyncClient(timeout=15) as client:
-                response = await client.get(url, follow_redirects=True)
+            # Download in streaming con budget di byte: il testo usato a
+            # valle è comunque tagliato a 10000 caratteri, scaricare
+            # body multi-MB sarebbe banda e CPU di parsing sprecate
+            chunks: List[bytes] = []
+            total = 0
+            async with self._get_http().stream("GET", url) as response:
                 response.raise_for_status()
-                
-                soup = BeautifulSoup(response.text, "lxml")
-                for tag in soup(["script", "style", "nav", "footer", "header"]):
-                    tag.decompose()
-                
-                text = soup.get_text(separator="\n", strip=True)
-                return text[:10000]
-                
+                async for chunk in response.aiter_bytes(16384):
+                    chunks.append(chunk)
+                    total += len(chunk)
+                    if total > _FETCH_BYTE_BUDGET:
+                        break
+
+            # Il parsing HTML è CPU-bound: spostarlo in un thread evita
+            # di bloccare l'event loop e lascia davvero sovrapporre i
+            # fetch concorrenti. I byte passano grezzi al parser, che
+            # gestisce la codifica dichiarata dalla pagina
+            text = await asyncio.to_thread(self._extract_text, b"".join(chunks))
+            if text:
+                _cache_put(key, text)
+            return text
+
         except Exception as e:
             self.log(f"Errore fetch: {e}", "ERROR")
             return ""
@@ -175,31 +446,60 @@ class ResearchAgent(BaseAgent):
             f"{topic} analisi"
         ]
         results["queries_used"] = queries
-        
-        # Ricerca web
-        for query in queries[:2]:
-            self.log(f"Query: {query}")
-            web_results = await self._web_search(query, max_results=5)
-            results["web_results"].extend(web_results)
-        
-        # Ricerca news
+
+        # Ricerca web + news in parallelo: il wall-time diventa
+        # max(latenze) invece della loro somma. Il semaforo limita la
+        # concorrenza per non incorrere nel rate limit DDGS.
+        sem = asyncio.Semaphore(10)
+
+        async def _bounded(coro):
+            async with sem:
+                return await coro
+
+        tasks = [_bounded(self._multi_web_search(queries[:2], max_results=5))]
         if include_news:
             self.log("Ricerca news...")
-            news_results = await self._news_search(topic, max_results=5)
-            results["news_results"] = news_results
-        
-        # Deep search
+            tasks.append(_bounded(self._news_search(topic, max_results=5)))
+
+        gathered = await asyncio.gather(*tasks, return_exceptions=True)
+
+        if include_news and not isinstance(gathered[-1], BaseException):
+            results["news_results"] = gathered[-1]
+
+        web_batches = gathered[0] if not isinstance(gathered[0], BaseException) else []
+        for query, batch in zip(queries, web_batches):
+            self.log(f"Query: {query}")
+            results["web_results"].extend(batch)
+
+        # Dedup: le query si sovrappongono e sprecherebbero slot nel
+        # contesto LLM ([:5]) oltre a gonfiare il prompt
+        results["web_results"] = _dedup_by_url(results["web_results"], "href", "link")
+
+        if results["news_results"]:
+            seen_news = set()
+            results["news_results"] = [
+                r for r in results["news_results"]
+                if (k := (r.get("title"), r.get("source"))) not in seen_news
+                and not seen_news.add(k)
+            ]
+
+        # Deep search (fetch concorrenti, sempre limitati dal semaforo)
         if deep_search and results["web_results"]:
             self.log("Deep search...")
-            for r in results["web_results"][:2]:
-                url = r.get("href", r.get("link"))
-                if url:
-                    content = await self._fetch_page(url)
-                    if content:
-                        results["deep_content"].append({
-                            "url": url,
-                            "content": content[:3000]
-                        })
+            urls = [
+                url for r in results["web_results"][:2]
+                if (url := r.get("href", r.get("link")))
+            ]
+            pages = await asyncio.gather(
+                *(_bounded(self._fetch_page(url)) for url in urls),
+                return_exceptions=True
+            )
+            for url, content in zip(urls, pages):
+                if content and not isinstance(content, BaseException):
+                    results["deep_content"].append({
+                        "url": url,
+                        "content": content[:3000]
+                    })
         
         # Analisi LLM
         analysis = await self._analyze_with_llm(topic, results)
@@ -209,24 +509,10 @@ class ResearchAgent(BaseAgent):
     
     async def _analyze_with_llm(self, topic: str, results: Dict) -> Dict[str, Any]:
         """Analizza risultati con LLM."""
-        
-        # Prepara contesto
-        context_parts = [f"Topic: {topic}\n"]
-        
-        context_parts.append("## Risultati Web:")
-        for i, r in enumerate(results["web_results"][:5], 1):
-            title = r.get("title", "N/A")
-            snippet = r.get("body", r.get("snippet", ""))[:200]
-            context_parts.append(f"{i}. {title}: {snippet}")
-        
-        if results["news_results"]:
-            context_parts.append("\n## News:")
-            for i, r in enumerate(results["news_results"][:3], 1):
-                title = r.get("title", "N/A")
-                source = r.get("source", "")
-                context_parts.append(f"{i}. [{source}] {title}")
-        
-        context = "\n".join(context_parts)
+
+        # Prepara contesto (builder condiviso: il blocco snippet viene
+        # memoizzato nel dict e riusato dal Synthesis Agent)
+        context = f"Topic: {topic}\n\n{build_snippet_block(results)}"
         
         prompt = """Analizza questi risultati di ricerca e fornisci:
 1. Un riassunto dei punti principali (3-5 frasi)
@@ -237,18 +523,17 @@ class ResearchAgent(BaseAgent):
 Rispondi in formato JSON."""
 
         try:
-            response = await self.invoke_llm(prompt, context)
-            
-            # Prova a parsare come JSON
-            try:
-                # Cerca JSON nella risposta
-                import re
-                json_match = re.search(r'\{[\s\S]*\}', response)
-                if json_match:
-                    return json.loads(json_match.group())
-            except json.JSONDecodeError:
-                pass
-            
+            # Streaming con early-exit: la generazione si ferma appena il
+            # blocco JSON è bilanciato. Il contesto è troncato a budget
+            # di token fisso: i token in ingresso pesano linearmente sul
+            # tempo di decodifica
+            response = await self.invoke_llm_json(prompt, fit(context, 1500))
+
+            # Prova a parsare come JSON (scanner bilanciato, niente regex greedy)
+            parsed = await extract_json_async(response, "obj")
+            if parsed is not None:
+                return parsed
+
             # Fallback: restituisci come testo
             return {
                 "summary": response,
@@ -8,11 +8,14 @@ Responsabilità:
 - Gestire citazioni e riferimenti
 """
 
-import json
+import asyncio
+import re
 from typing import Any, Dict, List, Optional
 from pathlib import Path
 from datetime import datetime
 
+from ._context_utils import build_snippet_block
+from ._json_utils import extract_json_async
 from .base_agent import (
     BaseAgent,
     AgentMessage,
@@ -41,9 +44,58 @@ Rispondi in italiano. Produci contenuti di alta qualità.
 """
 
 
+# Caratteri non ammessi nei nomi file dei report (precompilato a livello
+# modulo: la sub gira nel motore re in C invece che carattere per carattere).
+# \w è Unicode-aware come l'isalnum() usato in precedenza, quindi i topic
+# accentati ("sostenibilità") restano leggibili nel nome file
+_SAFE_NAME = re.compile(r'[^\w \-]')
+
+# Conteggio parole senza materializzare la lista di str.split()
+_WORD_RE = re.compile(r'\S+')
+
+
+def _word_count(text: str) -> int:
+    """Numero di parole, in O(n) e senza allocazioni proporzionali."""
+    return sum(1 for _ in _WORD_RE.finditer(text))
+
+
+# Parti statiche del template HTML: costanti di modulo, così il blocco
+# CSS (~1KB) non viene riallocato né ri-parsato come f-string a ogni report
+_HTML_STYLE = """    <style>
+        body { font-family: 'Segoe UI', Arial, sans-serif; max-width: 900px; margin: 0 auto; padding: 40px; line-height: 1.6; color: #333; }
+        h1 { color: #1a365d; border-bottom: 3px solid #3182ce; padding-bottom: 15px; }
+        h2 { color: #2c5282; margin-top: 40px; }
+        .meta { color: #718096; font-style: italic; margin-bottom: 30px; }
+        .summary { background: #f7fafc; border-left: 4px solid #3182ce; padding: 20px; margin: 30px 0; }
+        section { margin: 30px 0; }
+        .sources { background: #edf2f7; padding: 20px; border-radius: 8px; margin-top: 40px; }
+        .sources h2 { margin-top: 0; }
+        .sources ul { padding-left: 20px; }
+        .sources a { color: #3182ce; }
+        footer { margin-top: 50px; padding-top: 20px; border-top: 1px solid #e2e8f0; color: #a0aec0; font-size: 0.9em; }
+    </style>"""
+
+# Sezioni standard dei report: una generazione LLM per sezione
+SECTION_TITLES = (
+    "Contesto e Background",
+    "Analisi della Situazione Attuale",
+    "Trend e Sviluppi Chiave",
+    "Implicazioni e Opportunità",
+    "Conclusioni e Raccomandazioni",
+)
+
+_HTML_FOOTER = """    <footer>
+        Report generato automaticamente da Multi-Agent Research Assistant
+    </footer>
+</body>
+</html>"""
+
+
 class SynthesisAgent(BaseAgent):
     """Agente per sintesi e generazione report."""
-    
+
+    __slots__ = ("_output_dir",)
+
     def __init__(self, model: Optional[str] = None):
         super().__init__(
             agent_id="synthesis_agent",
@@ -56,7 +108,7 @@ class SynthesisAgent(BaseAgent):
         self._output_dir = Path("./outputs")
         self._output_dir.mkdir(exist_ok=True)
     
-    def get_capabilities(self) -> List[AgentCapability]:
+    def _build_capabilities(self) -> List[AgentCapability]:
         return [
             AgentCapability(
                 name="create_report",
@@ -163,13 +215,13 @@ class SynthesisAgent(BaseAgent):
         )
         
         # 5. Salva file
-        file_path = self._save_report(topic, report, output_format)
+        file_path = await self._save_report(topic, report, output_format)
         
         return {
             "topic": topic,
             "format": output_format,
             "sections_count": len(sections),
-            "word_count": len(report.split()),
+            "word_count": _word_count(report),
             "file_path": str(file_path),
             "report_preview": report[:2000] + "..." if len(report) > 2000 else report,
             "generated_at": datetime.now().isoformat()
@@ -187,19 +239,13 @@ class SynthesisAgent(BaseAgent):
         # Risultati ricerca
         if research_data:
             parts.append("## DATI DALLA RICERCA:")
-            
-            # Web results
-            for r in research_data.get("web_results", [])[:5]:
-                title = r.get("title", "")
-                snippet = r.get("body", r.get("snippet", ""))[:200]
-                parts.append(f"- {title}: {snippet}")
-            
-            # News
-            for r in research_data.get("news_results", [])[:3]:
-                title = r.get("title", "")
-                source = r.get("source", "")
-                parts.append(f"- [NEWS {source}] {title}")
-            
+
+            # Blocco snippet condiviso (già calcolato dal Research Agent
+            # sullo stesso dict: qui è un hit di memoizzazione)
+            snippet_block = build_snippet_block(research_data)
+            if snippet_block:
+                parts.append(snippet_block)
+
             # Analysis from research
             if "analysis" in research_data:
                 analysis = research_data["analysis"]
@@ -229,53 +275,49 @@ class SynthesisAgent(BaseAgent):
         return "\n".join(parts)
     
     async def _generate_sections(
-        self, 
-        topic: str, 
+        self,
+        topic: str,
         context: str,
         audience: str
     ) -> List[Dict[str, str]]:
-        """Genera le sezioni del report."""
-        
+        """
+        Genera le sezioni del report, una chiamata LLM per sezione.
+
+        Rispetto alla singola generazione monolitica in JSON: le N
+        chiamate brevi corrono in parallelo (batch_invoke_llm), il
+        caso peggiore di latenza scende e sparisce del tutto il rischio
+        di un parse JSON fallito che collassava il report in una
+        sezione unica.
+        """
         audience_instructions = {
             "business": "Usa linguaggio business-friendly, enfatizza impatti e opportunità",
             "technical": "Includi dettagli tecnici, usa terminologia appropriata",
             "executive": "Sii conciso, focus su decisioni e raccomandazioni"
         }
-        
-        prompt = f"""Crea le sezioni per un report su "{topic}".
+        instructions = audience_instructions.get(audience, '')
 
-Pubblico: {audience}
-Istruzioni specifiche: {audience_instructions.get(audience, '')}
+        prompts = [
+            (
+                f"""Scrivi la sezione "{title}" di un report su "{topic}".
 
-Genera 4-5 sezioni con questa struttura JSON:
-[
-  {{"title": "Titolo Sezione", "content": "Contenuto dettagliato della sezione (200-400 parole)"}},
-  ...
-]
+Pubblico: {audience}
+Istruzioni specifiche: {instructions}
 
-Sezioni suggerite:
-1. Contesto e Background
-2. Analisi della Situazione Attuale
-3. Trend e Sviluppi Chiave
-4. Implicazioni e Opportunità
-5. Conclusioni e Raccomandazioni
+Scrivi 200-400 parole. Basa il contenuto sui dati forniti, sii specifico
+e cita fonti dove possibile. Restituisci solo il testo della sezione,
+senza ripetere il titolo.""",
+                context
+            )
+            for title in SECTION_TITLES
+        ]
 
-Basa il contenuto sui dati forniti. Sii specifico e cita fonti dove possibile."""
+        contents = await self.batch_invoke_llm(prompts)
 
-        response = await self.invoke_llm(prompt, context)
-        
-        # Parse JSON
-        try:
-            import re
-            json_match = re.search(r'\[[\s\S]*\]', response)
-            if json_match:
-                sections = json.loads(json_match.group())
-                return sections
-        except json.JSONDecodeError:
-            pass
-        
-        # Fallback: crea sezione singola
-        return [{"title": "Analisi", "content": response}]
+        return [
+            {"title": title, "content": content}
+            for title, content in zip(SECTION_TITLES, contents)
+            if content.strip()
+        ]
     
     async def _generate_executive_summary(
         self,
@@ -416,80 +458,67 @@ Scrivi in modo professionale e diretto."""
     ) -> str:
         """Formatta report in HTML."""
         
-        sections_html = ""
+        # Accumulo in lista + join: il += su stringhe rialloca l'intero
+        # buffer a ogni sezione (O(n²) nel caso peggiore)
+        sections_parts: List[str] = []
         for s in sections:
             content_html = s['content'].replace('\n', '</p><p>')
-            sections_html += f"""
+            sections_parts.append(f"""
             <section>
                 <h2>{s['title']}</h2>
                 <p>{content_html}</p>
             </section>
-            """
-        
-        sources_html = ""
-        for i, src in enumerate(sources, 1):
+            """)
+        sections_html = "".join(sections_parts)
+
+        sources_parts: List[str] = []
+        for src in sources:
             title = src.get("title", "Fonte")
             url = src.get("url", "")
             if url:
-                sources_html += f'<li><a href="{url}" target="_blank">{title}</a></li>'
+                sources_parts.append(f'<li><a href="{url}" target="_blank">{title}</a></li>')
             else:
-                sources_html += f'<li>{title}</li>'
-        
-        return f"""<!DOCTYPE html>
-<html lang="it">
-<head>
-    <meta charset="UTF-8">
-    <title>{topic}</title>
-    <style>
-        body {{ font-family: 'Segoe UI', Arial, sans-serif; max-width: 900px; margin: 0 auto; padding: 40px; line-height: 1.6; color: #333; }}
-        h1 {{ color: #1a365d; border-bottom: 3px solid #3182ce; padding-bottom: 15px; }}
-        h2 {{ color: #2c5282; margin-top: 40px; }}
-        .meta {{ color: #718096; font-style: italic; margin-bottom: 30px; }}
-        .summary {{ background: #f7fafc; border-left: 4px solid #3182ce; padding: 20px; margin: 30px 0; }}
-        section {{ margin: 30px 0; }}
-        .sources {{ background: #edf2f7; padding: 20px; border-radius: 8px; margin-top: 40px; }}
-        .sources h2 {{ margin-top: 0; }}
-        .sources ul {{ padding-left: 20px; }}
-        .sources a {{ color: #3182ce; }}
-        footer {{ margin-top: 50px; padding-top: 20px; border-top: 1px solid #e2e8f0; color: #a0aec0; font-size: 0.9em; }}
-    </style>
-</head>
-<body>
-    <h1>{topic}</h1>
-    <p class="meta">Report generato il {datetime.now().strftime('%d/%m/%Y %H:%M')}</p>
-    
-    <div class="summary">
-        <h2>Executive Summary</h2>
-        <p>{summary}</p>
-    </div>
-    
-    {sections_html}
-    
-    <div class="sources">
-        <h2>Fonti e Riferimenti</h2>
-        <ol>{sources_html}</ol>
-    </div>
-    
-    <footer>
-        Report generato automaticamente da Multi-Agent Research Assistant
-    </footer>
-</body>
-</html>"""
+                sources_parts.append(f'<li>{title}</li>')
+        sources_html = "".join(sources_parts)
+
+        generated_at = datetime.now().strftime('%d/%m/%Y %H:%M')
+
+        return "\n".join([
+            "<!DOCTYPE html>",
+            '<html lang="it">',
+            "<head>",
+            '    <meta charset="UTF-8">',
+            f"    <title>{topic}</title>",
+            _HTML_STYLE,
+            "</head>",
+            "<body>",
+            f"    <h1>{topic}</h1>",
+            f'    <p class="meta">Report generato il {generated_at}</p>',
+            '    <div class="summary">',
+            "        <h2>Executive Summary</h2>",
+            f"        <p>{summary}</p>",
+            "    </div>",
+            sections_html,
+            '    <div class="sources">',
+            "        <h2>Fonti e Riferimenti</h2>",
+            f"        <ol>{sources_html}</ol>",
+            "    </div>",
+            _HTML_FOOTER,
+        ])
     
-    def _save_report(self, topic: str, content: str, format: str) -> Path:
-        """Salva report su file."""
-        
+    async def _save_report(self, topic: str, content: str, format: str) -> Path:
+        """Salva report su file (scrittura in thread, non blocca il loop)."""
+
         # Genera nome file
-        clean_topic = "".join(c if c.isalnum() or c in " -_" else "" for c in topic)
-        clean_topic = clean_topic.strip().replace(" ", "_")[:50]
+        clean_topic = _SAFE_NAME.sub("", topic).strip().replace(" ", "_")[:50]
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
+
         ext = "html" if format == "html" else "md"
         filename = f"report_{clean_topic}_{timestamp}.{ext}"
-        
+
         file_path = self._output_dir / filename
-        file_path.write_text(content, encoding="utf-8")
-        
+        await asyncio.to_thread(file_path.write_text, content, encoding="utf-8")
+
         self.log(f"Report salvato: {file_path}")
         return file_path
     
@@ -513,12 +542,16 @@ Requisiti:
 - Sii conciso ma completo"""
 
         summary = await self.invoke_llm(prompt, content[:8000])
-        
+
+        # Conta una volta sola e riusa
+        original_words = _word_count(content)
+        summary_words = _word_count(summary)
+
         return {
             "summary": summary,
-            "original_length": len(content.split()),
-            "summary_length": len(summary.split()),
-            "compression_ratio": round(len(summary.split()) / max(1, len(content.split())), 2)
+            "original_length": original_words,
+            "summary_length": summary_words,
+            "compression_ratio": round(summary_words / max(1, original_words), 2)
         }
     
     async def combine_sources(self, sources: List[Dict]) -> Dict[str, Any]:
@@ -560,15 +593,11 @@ Output in JSON:
 }"""
 
         response = await self.invoke_llm(prompt, context)
-        
-        try:
-            import re
-            json_match = re.search(r'\{[\s\S]*\}', response)
-            if json_match:
-                return json.loads(json_match.group())
-        except json.JSONDecodeError:
-            pass
-        
+
+        parsed = await extract_json_async(response, "obj")
+        if parsed is not None:
+            return parsed
+
         return {"combined_text": response}
 
 
@@ -3,8 +3,9 @@ Configurazione centralizzata per Multi-Agent Research Assistant.
 """
 
 import os
+import time
 from pathlib import Path
-from typing import Literal
+from typing import Literal, Optional
 
 # =============================================================================
 # DIRECTORIES
@@ -57,6 +58,20 @@ WEB_TIMEOUT: int = 15
 # User agent per requests
 USER_AGENT: str = "Mozilla/5.0 (compatible; ResearchAssistant/1.0)"
 
+# TTL cache ricerche web/news e fetch pagine (secondi).
+# La cache è anche persistita su disco sotto CACHE_DIR/web
+WEB_CACHE_TTL: int = 3600
+
+# Pool del client HTTP condiviso (un pool per processo: le richieste
+# gather-ate degli agenti attingono tutte dalle stesse connessioni
+# keep-alive invece di aprirne di nuove). HTTP_POOL_TIMEOUT deve essere
+# finito: con None una richiesta in attesa di connessione resterebbe
+# appesa indefinitamente sotto carico
+HTTP_MAX_CONNECTIONS: int = 100
+HTTP_MAX_KEEPALIVE: int = 20
+HTTP_KEEPALIVE_EXPIRY: float = 300.0
+HTTP_POOL_TIMEOUT: float = 10.0
+
 # =============================================================================
 # AGENT CONFIGURATION
 # =============================================================================
@@ -64,6 +79,29 @@ USER_AGENT: str = "Mozilla/5.0 (compatible; ResearchAssistant/1.0)"
 # Numero massimo di iterazioni per agente
 MAX_AGENT_ITERATIONS: int = 10
 
+# Numero massimo di messaggi A2A tenuti in memoria per agente
+# (la history è un ring buffer: i messaggi più vecchi vengono scartati)
+HISTORY_MAX: int = 1000
+
+# Persistenza della history messaggi su log binario append-only
+# (msgpack se installato, NDJSON altrimenti); il ring buffer in memoria
+# resta la finestra "calda"
+PERSIST_MESSAGE_LOG: bool = False
+MESSAGE_LOG_DIR = CACHE_DIR / "messages"
+
+# Cache semantica LLM: risposte riusate quando un prompt è simile
+# (coseno embeddings > soglia) a uno già visto. Richiede gli extra RAG
+# (sentence-transformers + faiss-cpu); disattivata di default perché
+# carica il modello embeddings in memoria
+SEMANTIC_CACHE: bool = False
+SEMANTIC_CACHE_THRESHOLD: float = 0.95
+SEMANTIC_CACHE_TTL: int = 7 * 86400
+
+# Fonti incluse nel contesto LLM dell'Analysis Agent, per tipo
+ANALYSIS_MAX_WEB_SOURCES: int = 5
+ANALYSIS_MAX_NEWS_SOURCES: int = 3
+ANALYSIS_MAX_DEEP_SOURCES: int = 2
+
 # Verbose logging
 VERBOSE: bool = True
 
@@ -111,27 +149,48 @@ def get_llm_config() -> dict:
     }
 
 
-def validate_ollama_connection() -> bool:
-    """Verifica che Ollama sia in esecuzione."""
-    import httpx
-    try:
-        response = httpx.get(f"{OLLAMA_BASE_URL}/api/tags", timeout=5)
-        return response.status_code == 200
-    except Exception:
-        return False
+# Cache TTL per /api/tags: check connessione e lista modelli vengono
+# richiamati back-to-back a ogni avvio CLI e in ogni demo — una sola
+# chiamata HTTP li serve entrambi per la finestra
+_OLLAMA_TAGS_TTL: float = 5.0
+_ollama_tags_cache: Optional[tuple[float, Optional[list[str]]]] = None
 
 
-def get_available_models() -> list[str]:
-    """Restituisce lista modelli Ollama disponibili."""
-    import httpx
+def _fetch_ollama_tags(refresh: bool = False) -> Optional[list[str]]:
+    """
+    Lista modelli da /api/tags, con cache TTL.
+
+    Returns:
+        Lista modelli (anche vuota) se Ollama risponde, None se non
+        raggiungibile
+    """
+    global _ollama_tags_cache
+    now = time.monotonic()
+
+    if not refresh and _ollama_tags_cache is not None and now < _ollama_tags_cache[0]:
+        return _ollama_tags_cache[1]
+
+    from utils.http_client import get_http_client
+    models: Optional[list[str]] = None
     try:
-        response = httpx.get(f"{OLLAMA_BASE_URL}/api/tags", timeout=5)
+        response = get_http_client().get(f"{OLLAMA_BASE_URL}/api/tags")
         if response.status_code == 200:
-            data = response.json()
-            return [m["name"] for m in data.get("models", [])]
+            models = [m["name"] for m in response.json().get("models", [])]
     except Exception:
-        pass
-    return []
+        models = None
+
+    _ollama_tags_cache = (now + _OLLAMA_TAGS_TTL, models)
+    return models
+
+
+def validate_ollama_connection(refresh: bool = False) -> bool:
+    """Verifica che Ollama sia in esecuzione."""
+    return _fetch_ollama_tags(refresh) is not None
+
+
+def get_available_models(refresh: bool = False) -> list[str]:
+    """Restituisce lista modelli Ollama disponibili."""
+    return _fetch_ollama_tags(refresh) or []
 
 
 if __name__ == "__main__":
@@ -18,21 +18,21 @@ from pathlib import Path
 # Aggiungi path progetto
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from rich.console import Console
 from rich.panel import Panel
 from rich.progress import Progress, SpinnerColumn, TextColumn
 from rich.markdown import Markdown
 
 from orchestrator import ResearchOrchestrator, run_research
 from config import validate_ollama_connection, OLLAMA_MODEL
+from utils.console import get_console
 
 
-console = Console()
+console = get_console()
 
 
-def print_banner():
-    """Stampa banner iniziale."""
-    banner = """
+# Banner e pannelli costruiti una sola volta a import time: i Panel sono
+# immutabili e il percorso choice == "5" li riusa più volte
+_BANNER = """
     ╔═══════════════════════════════════════════════════════════════╗
     ║                                                               ║
     ║   🏦  FINANCIAL RESEARCH ASSISTANT                            ║
@@ -42,7 +42,35 @@ def print_banner():
     ║                                                               ║
     ╚═══════════════════════════════════════════════════════════════╝
     """
-    console.print(banner, style="bold blue")
+
+_PANEL_DEMO1 = Panel.fit(
+    "[bold]DEMO 1: Ricerca Base[/bold]\n"
+    "Topic: AI nel settore bancario italiano",
+    border_style="cyan"
+)
+
+_PANEL_DEMO2 = Panel.fit(
+    "[bold]DEMO 2: Analisi di Mercato[/bold]\n"
+    "Topic: Trend fintech e digital banking",
+    border_style="green"
+)
+
+_PANEL_DEMO3 = Panel.fit(
+    "[bold]DEMO 3: Ricerca Normativa[/bold]\n"
+    "Topic: Regolamentazione AI nel settore finanziario",
+    border_style="yellow"
+)
+
+_PANEL_INTERACTIVE = Panel.fit(
+    "[bold]MODALITÀ INTERATTIVA[/bold]\n"
+    "Inserisci il tuo argomento di ricerca",
+    border_style="magenta"
+)
+
+
+def print_banner():
+    """Stampa banner iniziale."""
+    console.print(_BANNER, style="bold blue")
 
 
 def check_prerequisites():
@@ -65,11 +93,7 @@ def check_prerequisites():
 async def demo_basic_research():
     """Demo: ricerca base su un topic finanziario."""
     
-    console.print(Panel.fit(
-        "[bold]DEMO 1: Ricerca Base[/bold]\n"
-        "Topic: AI nel settore bancario italiano",
-        border_style="cyan"
-    ))
+    console.print(_PANEL_DEMO1)
     
     result = await run_research(
         query="Intelligenza artificiale settore bancario Italia 2026",
@@ -84,11 +108,7 @@ async def demo_basic_research():
 async def demo_market_analysis():
     """Demo: analisi di mercato con deep search."""
     
-    console.print(Panel.fit(
-        "[bold]DEMO 2: Analisi di Mercato[/bold]\n"
-        "Topic: Trend fintech e digital banking",
-        border_style="green"
-    ))
+    console.print(_PANEL_DEMO2)
     
     result = await run_research(
         query="Fintech digital banking trends Europe 2026",
@@ -103,11 +123,7 @@ async def demo_market_analysis():
 async def demo_regulatory_research():
     """Demo: ricerca su normative (rilevante per banche)."""
     
-    console.print(Panel.fit(
-        "[bold]DEMO 3: Ricerca Normativa[/bold]\n"
-        "Topic: Regolamentazione AI nel settore finanziario",
-        border_style="yellow"
-    ))
+    console.print(_PANEL_DEMO3)
     
     result = await run_research(
         query="EU AI Act financial services banking regulation",
@@ -155,28 +171,43 @@ def display_result(result: dict, demo_name: str):
 async def interactive_mode():
     """Modalità interattiva: l'utente inserisce la query."""
     
-    console.print(Panel.fit(
-        "[bold]MODALITÀ INTERATTIVA[/bold]\n"
-        "Inserisci il tuo argomento di ricerca",
-        border_style="magenta"
-    ))
-    
-    query = console.input("\n[bold cyan]📝 Argomento da ricercare:[/bold cyan] ")
-    
+    console.print(_PANEL_INTERACTIVE)
+
+    # console.input blocca l'event loop finché l'utente non digita:
+    # spostato in un thread, il loop resta libero (es. per il warm-up
+    # della connessione Ollama avviato qui sotto)
+    warmup = asyncio.create_task(
+        asyncio.to_thread(validate_ollama_connection, True)
+    )
+
+    query = await asyncio.to_thread(
+        console.input, "\n[bold cyan]📝 Argomento da ricercare:[/bold cyan] "
+    )
+
     if not query.strip():
         console.print("[yellow]Nessun argomento inserito, uso default[/yellow]")
         query = "Generative AI applications in banking"
-    
+
     # Opzioni
     console.print("\n[bold]Opzioni:[/bold]")
-    include_news = console.input("  Includere news? [S/n]: ").lower() != 'n'
-    deep_search = console.input("  Deep search (più lento)? [s/N]: ").lower() == 's'
-    
-    format_choice = console.input("  Formato output [markdown/html]: ").lower()
+    include_news = (await asyncio.to_thread(
+        console.input, "  Includere news? [S/n]: "
+    )).lower() != 'n'
+    deep_search = (await asyncio.to_thread(
+        console.input, "  Deep search (più lento)? [s/N]: "
+    )).lower() == 's'
+
+    format_choice = (await asyncio.to_thread(
+        console.input, "  Formato output [markdown/html]: "
+    )).lower()
     output_format = "html" if format_choice == "html" else "markdown"
     
     console.print(f"\n[bold]Avvio ricerca su:[/bold] {query}")
     console.print(f"  News: {include_news} | Deep: {deep_search} | Format: {output_format}\n")
+
+    # Il check è partito mentre l'utente digitava: qui è già concluso
+    if not await warmup:
+        console.print("[yellow]⚠️  Ollama non risponde, la ricerca potrebbe fallire[/yellow]")
     
     result = await run_research(
         query=query,
@@ -229,19 +260,22 @@ async def main():
         
     elif choice == "5":
         console.print("\n[bold]Esecuzione di tutte le demo...[/bold]\n")
-        
-        # Demo 1
-        result1 = await demo_basic_research()
-        display_result(result1, "Demo 1")
-        
-        # Demo 2
-        result2 = await demo_market_analysis()
-        display_result(result2, "Demo 2")
-        
-        # Demo 3
-        result3 = await demo_regulatory_research()
-        display_result(result3, "Demo 3")
-        
+
+        # Le demo sono coroutine indipendenti e network-bound: eseguite
+        # in parallelo il tempo totale è ~max(durate) invece della somma
+        results = await asyncio.gather(
+            demo_basic_research(),
+            demo_market_analysis(),
+            demo_regulatory_research(),
+            return_exceptions=True
+        )
+
+        for result, name in zip(results, ["Demo 1", "Demo 2", "Demo 3"]):
+            if isinstance(result, BaseException):
+                console.print(f"\n[bold red]❌ {name} fallita: {result}[/bold red]")
+            else:
+                display_result(result, name)
+
         console.print("\n[bold green]Tutte le demo completate![/bold green]")
         console.print("I report sono stati salvati nella cartella 'outputs/'")
     
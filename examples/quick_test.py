@@ -11,6 +11,14 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from agents import (
+    create_research_agent,
+    create_analysis_agent,
+    create_synthesis_agent
+)
+from orchestrator import run_research
+from config import validate_ollama_connection, OLLAMA_MODEL
+
 
 async def test_research_agent():
     """Test del solo Research Agent."""
@@ -18,8 +26,6 @@ async def test_research_agent():
     print("TEST: Research Agent")
     print("="*50)
     
-    from agents import create_research_agent
-    
     agent = create_research_agent()
     
     # Test ricerca semplice
@@ -47,8 +53,6 @@ async def test_analysis_agent():
     print("TEST: Analysis Agent")
     print("="*50)
     
-    from agents import create_analysis_agent
-    
     agent = create_analysis_agent()
     
     # Testo di esempio
@@ -73,8 +77,6 @@ async def test_synthesis_agent():
     print("TEST: Synthesis Agent")
     print("="*50)
     
-    from agents import create_synthesis_agent
-    
     agent = create_synthesis_agent()
     
     # Dati di esempio
@@ -112,8 +114,6 @@ async def test_full_workflow():
     print("TEST: Workflow Completo (A2A)")
     print("="*50)
     
-    from orchestrator import run_research
-    
     result = await run_research(
         query="AI generativa nel settore bancario",
         include_news=True,
@@ -138,9 +138,6 @@ async def main():
     ╚═══════════════════════════════════════════════════╝
     """)
     
-    # Verifica Ollama
-    from config import validate_ollama_connection, OLLAMA_MODEL
-    
     if not validate_ollama_connection():
         print("❌ Ollama non disponibile!")
         print("   Avvia con: ollama serve")
@@ -167,12 +164,22 @@ async def main():
     elif choice == "4":
         await test_full_workflow()
     elif choice == "5":
-        await test_research_agent()
-        await test_analysis_agent()
-        await test_synthesis_agent()
-        await test_full_workflow()
+        # Test indipendenti e network-bound: in parallelo il tempo
+        # totale è ~max(durate) invece della somma
+        results = await asyncio.gather(
+            test_research_agent(),
+            test_analysis_agent(),
+            test_synthesis_agent(),
+            test_full_workflow(),
+            return_exceptions=True
+        )
+
+        failures = [r for r in results if isinstance(r, BaseException)]
         print("\n" + "="*50)
-        print("✅ TUTTI I TEST COMPLETATI!")
+        if failures:
+            print(f"❌ {len(failures)} TEST FALLITI: {failures}")
+        else:
+            print("✅ TUTTI I TEST COMPLETATI!")
         print("="*50)
     else:
         print("Uscita.")
@@ -10,7 +10,13 @@ Supporta:
 Segue le best practices MCP di Anthropic.
 """
 
+import asyncio
+import fnmatch
+import functools
 import json
+import os
+import re
+import stat as stat_module
 from pathlib import Path
 from typing import Optional, List
 from enum import Enum
@@ -118,32 +124,216 @@ class ExtractTextInput(BaseModel):
 # Helper Functions
 # =============================================================================
 
-def get_file_metadata(path: Path) -> dict:
-    """Estrae metadati di un file."""
-    stat = path.stat()
+# Serializzazione JSON: orjson (parser C, 3-10x stdlib) quando installato,
+# fallback trasparente su json. Il server resta standalone: niente import
+# dal resto del progetto.
+try:
+    import orjson
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+
+except ImportError:
+
+    def _json_dumps(obj) -> str:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+
+
+# Riconoscimento header per l'estrazione strutturata: una sola alternazione
+# compilata a import time al posto di quattro re.match per riga
+_HEADER_RE = re.compile(
+    r"^(?:#{1,3}\s+"                      # Markdown
+    r"|[0-9]+(?:\.[0-9]+)*\s+[A-Z]"       # 1.2 Title
+    r"|(?i:Chapter|Section|Part)\s+)"     # Keywords (case-insensitive)
+)
+# Scansione righe senza materializzare la lista di splitlines():
+# ogni match è una riga non vuota, direttamente dal motore regex in C
+_LINE_RE = re.compile(r"[^\n]+")
+
+
+def _normalize(p: str) -> Path:
+    """
+    Normalizza il percorso ricevuto dal tool.
+
+    resolve() risale la catena di symlink con un lstat per componente:
+    per un input già assoluto e senza ~, . o .. non c'è nulla da
+    risolvere e il Path viene usato com'è.
+    """
+    if p.startswith("/") and "~" not in p and "/./" not in p \
+            and "/../" not in p and not p.endswith(("/.", "/..")):
+        return Path(p)
+    return Path(p).expanduser().resolve()
+
+
+def _stat_or_none(path: Path) -> Optional[os.stat_result]:
+    """
+    Un solo stat per richiesta al posto della catena
+    exists() + is_file() + get_file_metadata(): ogni Path.exists/is_file
+    è una syscall separata, qui esistenza, tipo e metadati escono tutti
+    dallo stesso stat_result.
+    """
+    try:
+        return path.stat()
+    except OSError:
+        return None
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_glob(pattern: str):
+    """
+    Compila una volta il pattern glob in un matcher regex.
+
+    fnmatch.fnmatchcase ritraduce (e ricerca in una cache globale con
+    lock) il pattern a ogni chiamata: su listing con migliaia di entry
+    conviene compilare una volta e riusare il bound method ``match``.
+    """
+    return re.compile(fnmatch.translate(pattern)).match
+
+
+def iter_files(directory: str, pattern: str, recursive: bool):
+    """
+    Itera i file di una directory che combaciano col pattern glob.
+
+    Usa os.scandir invece di Path.glob: i DirEntry restituiti portano lo
+    stat in cache (circa metà delle syscall su listing ricorsivi) e non
+    allocano un oggetto Path per entry.
+
+    Yields:
+        os.DirEntry per ogni file che combacia
+    """
+    match = _compile_glob(pattern)
+    stack = [directory]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive:
+                            stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False) and \
+                            match(entry.name):
+                        yield entry
+        except PermissionError:
+            continue
+
+
+# Thread per il walk parallelo: oltre 4 il readdir su NVMe non scala più
+_WALK_MAX_WORKERS = 4
+
+
+def _scan_dir(path: str, match) -> tuple:
+    """Scansiona una singola directory: (file filtrati, sottodirectory)."""
+    files = []
+    subdirs = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.is_file(follow_symlinks=False) and \
+                        match(entry.name):
+                    files.append(entry)
+    except PermissionError:
+        pass
+    return files, subdirs
+
+
+def iter_files_parallel(directory: str, pattern: str):
+    """
+    Variante parallela di iter_files per i walk ricorsivi.
+
+    os.scandir rilascia il GIL durante la getdents: con poche thread le
+    scansioni delle sottodirectory si sovrappongono invece di accodarsi.
+    Ogni task restituisce (file, sottodir) e le sottodir diventano nuovi
+    task man mano che i risultati arrivano.
+
+    Yields:
+        os.DirEntry per ogni file che combacia
+    """
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    match = _compile_glob(pattern)
+    with ThreadPoolExecutor(max_workers=_WALK_MAX_WORKERS) as pool:
+        pending = {pool.submit(_scan_dir, directory, match)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, subdirs = future.result()
+                yield from files
+                pending.update(
+                    pool.submit(_scan_dir, d, match) for d in subdirs
+                )
+
+
+def get_file_metadata(path: Path, stat: Optional[os.stat_result] = None) -> dict:
+    """
+    Estrae metadati di un file.
+
+    Args:
+        path: Percorso del file
+        stat: stat_result già disponibile (es. dalla cache di un
+            DirEntry), per evitare una seconda syscall
+
+    Returns:
+        Dizionario con nome, dimensione e timestamp
+    """
+    st = stat if stat is not None else path.stat()
     return {
         "name": path.name,
         "extension": path.suffix.lower(),
-        "size_bytes": stat.st_size,
-        "size_human": _human_size(stat.st_size),
-        "modified": datetime.fromtimestamp(stat.st_mtime).isoformat(),
-        "created": datetime.fromtimestamp(stat.st_ctime).isoformat()
+        "size_bytes": st.st_size,
+        "size_human": _human_size(st.st_size),
+        "modified": datetime.fromtimestamp(st.st_mtime).isoformat(timespec="seconds"),
+        "created": datetime.fromtimestamp(st.st_ctime).isoformat(timespec="seconds")
     }
 
 
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB")
+
+
 def _human_size(size_bytes: int) -> str:
-    """Converte bytes in formato leggibile."""
-    for unit in ["B", "KB", "MB", "GB"]:
-        if size_bytes < 1024:
-            return f"{size_bytes:.1f} {unit}"
-        size_bytes /= 1024
-    return f"{size_bytes:.1f} TB"
+    """
+    Converte bytes in formato leggibile.
+
+    L'unità è scelta in O(1) dal bit_length (10 bit per fattore 1024),
+    senza il loop di divisioni float — chiamata per ogni file listato.
+    """
+    i = min((size_bytes.bit_length() - 1) // 10, 4) if size_bytes > 0 else 0
+    return f"{size_bytes / (1 << (10 * i)):.1f} {_SIZE_UNITS[i]}"
+
+
+# Sotto questa soglia il set puro-Python batte l'overhead numpy
+_PAGE_MASK_THRESHOLD = 1024
 
 
 def parse_page_range(pages_str: str, max_pages: int) -> List[int]:
     """Parsa stringa di pagine in lista di indici."""
+    if max_pages >= _PAGE_MASK_THRESHOLD:
+        try:
+            import numpy as np
+        except ImportError:
+            pass
+        else:
+            # Maschera booleana + flatnonzero: niente set di int boxed
+            # per range tipo "1-10000"
+            mask = np.zeros(max_pages, dtype=bool)
+            for part in pages_str.split(","):
+                part = part.strip()
+                if "-" in part:
+                    start, end = part.split("-", 1)
+                    start = max(int(start) if start else 1, 1)
+                    end = min(int(end) if end else max_pages, max_pages)
+                    if start <= end:
+                        mask[start - 1:end] = True
+                else:
+                    page = int(part)
+                    if 1 <= page <= max_pages:
+                        mask[page - 1] = True
+            return (np.flatnonzero(mask) + 1).tolist()
+
     result = set()
-    
+
     for part in pages_str.split(","):
         part = part.strip()
         if "-" in part:
@@ -155,55 +345,424 @@ def parse_page_range(pages_str: str, max_pages: int) -> List[int]:
             page = int(part)
             if 1 <= page <= max_pages:
                 result.add(page)
-    
+
     return sorted(result)
 
 
 def read_pdf(file_path: Path, pages: Optional[str] = None, max_chars: int = 15000) -> dict:
-    """Legge un file PDF."""
+    """
+    Legge un file PDF.
+
+    Ordine dei backend: PyMuPDF (parser C, il più veloce su estrazione
+    di puro testo), poi pypdfium2, infine il puro Python pypdf. Il
+    fallback è automatico in base a cosa è installato.
+
+    Il risultato è memoizzato su (path, mtime, pagine, budget): più tool
+    nello stesso turno dell'agente rileggono spesso lo stesso documento,
+    e il parsing è di gran lunga il costo dominante. La chiave include
+    l'mtime, quindi una modifica al file invalida da sola la cache.
+    """
+    return _read_pdf_cached(
+        str(file_path), os.stat(file_path).st_mtime_ns, pages, max_chars
+    )
+
+
+@functools.lru_cache(maxsize=16)
+def _read_pdf_cached(path_str: str, mtime_ns: int,
+                     pages: Optional[str], max_chars: int) -> dict:
+    file_path = Path(path_str)
+    if pages:
+        parallel = _maybe_read_pdf_parallel(file_path, pages, max_chars)
+        if parallel is not None:
+            return parallel
+
+    try:
+        import fitz  # noqa: F401  (PyMuPDF)
+        return _read_pdf_fitz(file_path, pages, max_chars)
+    except ImportError:
+        pass
+    try:
+        import pypdfium2  # noqa: F401
+        return _read_pdf_pdfium(file_path, pages, max_chars)
+    except ImportError:
+        return _read_pdf_pypdf(file_path, pages, max_chars)
+
+
+# Sopra questa soglia di pagine richieste conviene distribuire il parsing
+# (CPU-bound nel parser PDF) su più processi
+_PARALLEL_PAGE_THRESHOLD = 8
+
+
+@functools.lru_cache(maxsize=None)
+def _get_pdf_pool():
+    """Pool di processi condiviso per il parsing PDF, creato al primo uso."""
+    from concurrent.futures import ProcessPoolExecutor
+    return ProcessPoolExecutor(max_workers=min(4, os.cpu_count() or 1))
+
+
+def _extract_pages_chunk(file_path: str, page_numbers: List[int]) -> list:
+    """
+    Worker di processo: estrae un blocco di pagine da un PDF.
+
+    Riapre il documento nel worker (l'open è economico rispetto al
+    parsing) e restituisce coppie (numero_pagina, testo).
+    """
+    try:
+        import fitz
+        doc = fitz.open(file_path)
+        try:
+            return [(n, doc[n - 1].get_text("text") or "")
+                    for n in page_numbers]
+        finally:
+            doc.close()
+    except ImportError:
+        pass
+    try:
+        import pypdfium2 as pdfium
+        pdf = pdfium.PdfDocument(file_path)
+        try:
+            out = []
+            for n in page_numbers:
+                page = pdf[n - 1]
+                textpage = page.get_textpage()
+                try:
+                    out.append((n, textpage.get_text_range() or ""))
+                finally:
+                    textpage.close()
+                    page.close()
+            return out
+        finally:
+            pdf.close()
+    except ImportError:
+        from pypdf import PdfReader
+        reader = PdfReader(file_path)
+        return [(n, reader.pages[n - 1].extract_text() or "")
+                for n in page_numbers]
+
+
+def _maybe_read_pdf_parallel(file_path: Path, pages: str,
+                             max_chars: int) -> Optional[dict]:
+    """
+    Estrazione multi-processo per range di pagine ampi.
+
+    Restituisce None quando non conviene (poche pagine o un solo core):
+    il chiamante ricade sul percorso seriale con early-exit sul budget.
+    """
+    workers = min(4, os.cpu_count() or 1)
+    if workers < 2:
+        return None
+
+    total_pages, metadata = _pdf_open_info(str(file_path))
+    page_numbers = parse_page_range(pages, total_pages)
+    if len(page_numbers) <= _PARALLEL_PAGE_THRESHOLD:
+        return None
+
+    # Blocchi contigui, uno per worker: l'ordine si ricompone concatenando
+    chunk_size = -(-len(page_numbers) // workers)
+    chunks = [page_numbers[i:i + chunk_size]
+              for i in range(0, len(page_numbers), chunk_size)]
+    pool = _get_pdf_pool()
+    futures = [pool.submit(_extract_pages_chunk, str(file_path), chunk)
+               for chunk in chunks]
+
+    text_parts = []
+    chars_count = 0
+    pages_read = []
+    for future in futures:
+        for page_num, page_text in future.result():
+            if chars_count >= max_chars:
+                continue
+            truncated = chars_count + len(page_text) > max_chars
+            if truncated:
+                remaining = max_chars - chars_count
+                page_text = page_text[:remaining] + "\n[... troncato ...]"
+            text_parts.append(f"--- Pagina {page_num} ---\n{page_text}")
+            chars_count += len(page_text)
+            pages_read.append(page_num)
+
+    return {
+        "total_pages": total_pages,
+        "pages_read": pages_read,
+        "chars_extracted": chars_count,
+        "text": "\n\n".join(text_parts),
+        "metadata": metadata
+    }
+
+
+def _format_sections_output(sections: list, metadata: Optional[dict]) -> str:
+    """Formatta in markdown le sezioni identificate in un documento."""
+    output = []
+    if metadata:
+        output.append(f"## 📄 {metadata['name']}")
+        output.append(f"*{metadata['size_human']} | {len(sections)} sezioni identificate*\n")
+
+    for i, section in enumerate(sections, 1):
+        output.append(f"### {i}. {section['title']}")
+        content = " ".join(section["content"][:500])  # Max 500 parole
+        output.append(f"{content}\n")
+
+    return "\n".join(output)
+
+
+def _pdf_structured_sections(file_path: Path,
+                             max_chars: int = 20000) -> Optional[list]:
+    """
+    Sezioni di un PDF ricavate dalla struttura del documento.
+
+    PyMuPDF espone già dimensione font e flag bold per span: gli span
+    sopra il 75° percentile di dimensione (o in grassetto) sono titoli,
+    senza passare dall'euristica regex sul testo piatto. Restituisce
+    None quando PyMuPDF non è installato: il chiamante ricade
+    sull'euristica.
+    """
+    try:
+        import fitz
+    except ImportError:
+        return None
+
+    doc = fitz.open(str(file_path))
+    try:
+        spans = []  # (testo, size, bold)
+        chars_count = 0
+        for page in doc:
+            for block in page.get_text("dict").get("blocks", []):
+                for line in block.get("lines", []):
+                    for span in line.get("spans", []):
+                        text = span["text"].strip()
+                        if not text:
+                            continue
+                        spans.append(
+                            (text, span["size"], bool(span["flags"] & 16))
+                        )
+                        chars_count += len(text)
+            if chars_count >= max_chars:
+                break
+    finally:
+        doc.close()
+
+    if not spans:
+        return None
+
+    sizes = sorted(s for _, s, _ in spans)
+    p75 = sizes[(3 * len(sizes)) // 4]
+
+    sections = []
+    current = {"title": "Introduzione", "content": []}
+    for text, size, bold in spans:
+        is_header = len(text) < 100 and (size > p75 or bold)
+        if is_header:
+            if current["content"]:
+                sections.append(current)
+            current = {"title": text, "content": []}
+        else:
+            current["content"].append(text)
+    if current["content"]:
+        sections.append(current)
+
+    return sections
+
+
+def _pdf_open_info(file_path: str) -> tuple:
+    """Apre il PDF solo per contare le pagine e leggere i metadati."""
+    try:
+        import fitz
+        doc = fitz.open(file_path)
+        try:
+            return doc.page_count, dict(doc.metadata or {})
+        finally:
+            doc.close()
+    except ImportError:
+        pass
+    try:
+        import pypdfium2 as pdfium
+        pdf = pdfium.PdfDocument(file_path)
+        try:
+            try:
+                metadata = pdf.get_metadata_dict()
+            except Exception:
+                metadata = {}
+            return len(pdf), metadata
+        finally:
+            pdf.close()
+    except ImportError:
+        from pypdf import PdfReader
+        reader = PdfReader(file_path)
+        metadata = (
+            {k.lstrip("/"): str(v) for k, v in reader.metadata.items()}
+            if reader.metadata else {}
+        )
+        return len(reader.pages), metadata
+
+
+def _read_pdf_fitz(file_path: Path, pages: Optional[str], max_chars: int) -> dict:
+    """Estrazione via PyMuPDF: le pagine oltre il budget non vengono parsate."""
+    import fitz
+
+    doc = fitz.open(str(file_path))
+    try:
+        total_pages = doc.page_count
+
+        if pages:
+            page_numbers = parse_page_range(pages, total_pages)
+        else:
+            page_numbers = list(range(1, total_pages + 1))
+
+        text_parts = []
+        chars_count = 0
+        pages_read = []
+
+        for page_num in page_numbers:
+            if chars_count >= max_chars:
+                break
+
+            page_text = doc[page_num - 1].get_text("text") or ""
+
+            truncated = chars_count + len(page_text) > max_chars
+            if truncated:
+                remaining = max_chars - chars_count
+                page_text = page_text[:remaining] + "\n[... troncato ...]"
+
+            text_parts.append(f"--- Pagina {page_num} ---\n{page_text}")
+            chars_count += len(page_text)
+            pages_read.append(page_num)
+
+            # Budget esaurito: esci subito senza tornare in testa al loop
+            if truncated:
+                break
+
+        return {
+            "total_pages": total_pages,
+            "pages_read": pages_read,
+            "chars_extracted": chars_count,
+            "text": "\n\n".join(text_parts),
+            "metadata": dict(doc.metadata or {})
+        }
+    finally:
+        doc.close()
+
+
+def _read_pdf_pdfium(file_path: Path, pages: Optional[str], max_chars: int) -> dict:
+    """Estrazione via pypdfium2: le pagine oltre il budget non vengono parsate."""
+    import pypdfium2 as pdfium
+
+    pdf = pdfium.PdfDocument(str(file_path))
+    try:
+        total_pages = len(pdf)
+
+        if pages:
+            page_numbers = parse_page_range(pages, total_pages)
+        else:
+            page_numbers = list(range(1, total_pages + 1))
+
+        text_parts = []
+        chars_count = 0
+        pages_read = []
+
+        for page_num in page_numbers:
+            if chars_count >= max_chars:
+                break
+
+            page = pdf[page_num - 1]  # 0-indexed
+            textpage = page.get_textpage()
+            try:
+                page_text = textpage.get_text_range() or ""
+            finally:
+                # Libera subito la memoria nativa, senza aspettare il GC
+                textpage.close()
+                page.close()
+
+            truncated = chars_count + len(page_text) > max_chars
+            if truncated:
+                remaining = max_chars - chars_count
+                page_text = page_text[:remaining] + "\n[... troncato ...]"
+
+            text_parts.append(f"--- Pagina {page_num} ---\n{page_text}")
+            chars_count += len(page_text)
+            pages_read.append(page_num)
+
+            # Budget esaurito: esci subito senza tornare in testa al loop
+            if truncated:
+                break
+
+        try:
+            metadata = pdf.get_metadata_dict()
+        except Exception:
+            metadata = {}
+
+        return {
+            "total_pages": total_pages,
+            "pages_read": pages_read,
+            "chars_extracted": chars_count,
+            "text": "\n\n".join(text_parts),
+            "metadata": metadata
+        }
+    finally:
+        pdf.close()
+
+
+def _read_pdf_pypdf(file_path: Path, pages: Optional[str], max_chars: int) -> dict:
+    """Estrazione di fallback via pypdf (puro Python)."""
     from pypdf import PdfReader
-    
+
     reader = PdfReader(str(file_path))
     total_pages = len(reader.pages)
-    
+
     # Determina quali pagine leggere
     if pages:
         page_numbers = parse_page_range(pages, total_pages)
     else:
         page_numbers = list(range(1, total_pages + 1))
-    
+
     # Estrai testo
     text_parts = []
     chars_count = 0
     pages_read = []
-    
+
     for page_num in page_numbers:
         if chars_count >= max_chars:
             break
-            
+
         page = reader.pages[page_num - 1]  # 0-indexed
         page_text = page.extract_text() or ""
-        
-        if chars_count + len(page_text) > max_chars:
+
+        truncated = chars_count + len(page_text) > max_chars
+        if truncated:
             remaining = max_chars - chars_count
             page_text = page_text[:remaining] + "\n[... troncato ...]"
-        
+
         text_parts.append(f"--- Pagina {page_num} ---\n{page_text}")
         chars_count += len(page_text)
         pages_read.append(page_num)
-    
+
+        # Budget esaurito: esci subito senza tornare in testa al loop
+        if truncated:
+            break
+
     return {
         "total_pages": total_pages,
         "pages_read": pages_read,
         "chars_extracted": chars_count,
         "text": "\n\n".join(text_parts),
-        "metadata": reader.metadata._data if reader.metadata else {}
+        # Iterazione pubblica: ._data è interno e cambia tra versioni pypdf
+        "metadata": (
+            {k.lstrip("/"): str(v) for k, v in reader.metadata.items()}
+            if reader.metadata else {}
+        )
     }
 
 
 def read_docx(file_path: Path, max_chars: int = 10000) -> dict:
-    """Legge un file DOCX."""
+    """Legge un file DOCX (memoizzato su path+mtime come read_pdf)."""
+    return _read_docx_cached(
+        str(file_path), os.stat(file_path).st_mtime_ns, max_chars
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def _read_docx_cached(path_str: str, mtime_ns: int, max_chars: int) -> dict:
     from docx import Document
+
+    file_path = Path(path_str)
     
     doc = Document(str(file_path))
     
@@ -227,9 +786,13 @@ def read_docx(file_path: Path, max_chars: int = 10000) -> dict:
             break
         rows = []
         for row in table.rows:
-            cells = [cell.text.strip() for cell in row.cells]
-            rows.append(" | ".join(cells))
-            chars_count += sum(len(c) for c in cells)
+            # Conteggio sulla riga già joinata: niente generatore extra
+            # né secondo passaggio sulle celle
+            line = " | ".join(cell.text.strip() for cell in row.cells)
+            rows.append(line)
+            chars_count += len(line)
+            if chars_count >= max_chars:
+                break
         tables_text.append("\n".join(rows))
     
     return {
@@ -245,25 +808,81 @@ def read_docx(file_path: Path, max_chars: int = 10000) -> dict:
     }
 
 
+# Sotto questa soglia il file viene letto con una singola os.read
+_SMALL_FILE_BYTES = 65536
+
+
 def read_text_file(file_path: Path, max_chars: int = 10000) -> dict:
-    """Legge un file di testo (txt, md, csv, etc.)."""
+    """
+    Legge un file di testo (txt, md, csv, etc.).
+
+    Lettura limitata a max_chars: un read_text() intero materializzerebbe
+    anche file da centinaia di MB solo per poi troncarli. I file piccoli
+    (<64KB, il caso tipico di txt/md/csv) saltano del tutto lo stack
+    TextIOWrapper: una os.read del file intero e un decode unico.
+    Memoizzato su path+mtime come read_pdf.
+    """
+    return _read_text_file_cached(
+        str(file_path), os.stat(file_path).st_mtime_ns, max_chars
+    )
+
+
+@functools.lru_cache(maxsize=64)
+def _read_text_file_cached(path_str: str, mtime_ns: int, max_chars: int) -> dict:
+    file_path = Path(path_str)
+    data = None
+    fd = os.open(str(file_path), os.O_RDONLY)
     try:
-        content = file_path.read_text(encoding="utf-8")
-    except UnicodeDecodeError:
-        content = file_path.read_text(encoding="latin-1")
-    
-    if len(content) > max_chars:
+        if os.fstat(fd).st_size <= _SMALL_FILE_BYTES:
+            data = os.read(fd, _SMALL_FILE_BYTES)
+    finally:
+        os.close(fd)
+
+    # Un carattere in più per capire se il file eccede il budget
+    if data is not None:
+        try:
+            content = data.decode("utf-8")
+        except UnicodeDecodeError:
+            content = data.decode("latin-1")
+        content = content[:max_chars + 1]
+    else:
+        try:
+            with file_path.open("r", encoding="utf-8") as f:
+                content = f.read(max_chars + 1)
+        except UnicodeDecodeError:
+            with file_path.open("r", encoding="latin-1") as f:
+                content = f.read(max_chars + 1)
+
+    truncated = len(content) > max_chars
+    if truncated:
         content = content[:max_chars] + "\n\n[... troncato ...]"
-    
-    lines = content.split("\n")
-    
+
     return {
-        "total_lines": len(lines),
+        "total_lines": content.count("\n") + 1,
         "total_chars": len(content),
+        "truncated": truncated,
         "text": content
     }
 
 
+# Wrapper async: parsing PDF/DOCX e I/O su disco sono bloccanti, eseguirli
+# nell'event loop congelerebbe il server MCP per l'intera estrazione.
+async def read_pdf_async(file_path: Path, pages: Optional[str] = None,
+                         max_chars: int = 15000) -> dict:
+    """Variante non bloccante di read_pdf (thread pool)."""
+    return await asyncio.to_thread(read_pdf, file_path, pages, max_chars)
+
+
+async def read_docx_async(file_path: Path, max_chars: int = 10000) -> dict:
+    """Variante non bloccante di read_docx (thread pool)."""
+    return await asyncio.to_thread(read_docx, file_path, max_chars)
+
+
+async def read_text_file_async(file_path: Path, max_chars: int = 10000) -> dict:
+    """Variante non bloccante di read_text_file (thread pool)."""
+    return await asyncio.to_thread(read_text_file, file_path, max_chars)
+
+
 # =============================================================================
 # MCP Tools
 # =============================================================================
@@ -291,37 +910,38 @@ async def file_reader_read(params: ReadFileInput) -> str:
     Returns:
         Contenuto del file in formato markdown o JSON
     """
-    path = Path(params.file_path).expanduser().resolve()
-    
-    if not path.exists():
+    path = _normalize(params.file_path)
+
+    st = _stat_or_none(path)
+    if st is None:
         return f"## ❌ Errore\n\nFile non trovato: {params.file_path}"
-    
-    if not path.is_file():
+
+    if not stat_module.S_ISREG(st.st_mode):
         return f"## ❌ Errore\n\nIl percorso non è un file: {params.file_path}"
-    
+
     ext = path.suffix.lower()
-    metadata = get_file_metadata(path)
+    metadata = get_file_metadata(path, st)
     
     try:
         if ext == ".pdf":
-            result = read_pdf(path, max_chars=params.max_chars)
+            result = await read_pdf_async(path, max_chars=params.max_chars)
             content = result["text"]
         elif ext in [".docx", ".doc"]:
-            result = read_docx(path, max_chars=params.max_chars)
+            result = await read_docx_async(path, max_chars=params.max_chars)
             content = result["text"]
             if result["tables"]:
                 content += "\n\n### Tabelle\n\n" + "\n\n---\n\n".join(result["tables"])
         else:
-            result = read_text_file(path, max_chars=params.max_chars)
+            result = await read_text_file_async(path, max_chars=params.max_chars)
             content = result["text"]
         
         if params.response_format == ResponseFormat.JSON:
-            return json.dumps({
+            return _json_dumps({
                 "file": str(path),
                 "metadata": metadata,
                 "content": content,
                 "extraction_info": {k: v for k, v in result.items() if k != "text"}
-            }, indent=2, ensure_ascii=False)
+            })
         
         elif params.response_format == ResponseFormat.RAW:
             return content
@@ -362,16 +982,16 @@ async def file_reader_read_pdf(params: ReadPDFInput) -> str:
     Returns:
         Testo estratto dal PDF con indicazione delle pagine
     """
-    path = Path(params.file_path).expanduser().resolve()
-    
-    if not path.exists():
+    path = _normalize(params.file_path)
+
+    if _stat_or_none(path) is None:
         return f"## ❌ Errore\n\nFile non trovato: {params.file_path}"
-    
+
     if path.suffix.lower() != ".pdf":
         return f"## ❌ Errore\n\nIl file non è un PDF: {params.file_path}"
     
     try:
-        result = read_pdf(path, pages=params.pages, max_chars=params.max_chars)
+        result = await read_pdf_async(path, pages=params.pages, max_chars=params.max_chars)
         
         output = [
             f"## 📄 {path.name}",
@@ -409,51 +1029,56 @@ async def file_reader_list(params: ListFilesInput) -> str:
     Returns:
         Lista di file con metadati
     """
-    dir_path = Path(params.directory).expanduser().resolve()
-    
-    if not dir_path.exists():
+    dir_path = _normalize(params.directory)
+
+    st = _stat_or_none(dir_path)
+    if st is None:
         return f"## ❌ Errore\n\nDirectory non trovata: {params.directory}"
-    
-    if not dir_path.is_dir():
+
+    if not stat_module.S_ISDIR(st.st_mode):
         return f"## ❌ Errore\n\nIl percorso non è una directory: {params.directory}"
     
-    # Trova files
-    if params.recursive:
-        files = list(dir_path.rglob(params.pattern))
-    else:
-        files = list(dir_path.glob(params.pattern))
-    
-    # Solo files, non directories
-    files = [f for f in files if f.is_file()]
-    
-    if not files:
+    # Raggruppa per estensione già durante la scansione, tenendo al
+    # massimo 20 entry per tipo: su alberi grandi evita di materializzare
+    # (e ordinare) liste enormi solo per poi tagliarle a [:20]
+    by_ext: dict = {}
+    counts: dict = {}
+    total = 0
+    # Walk parallelo sugli alberi ricorsivi, seriale sul listing piatto
+    entries = (
+        iter_files_parallel(str(dir_path), params.pattern)
+        if params.recursive
+        else iter_files(str(dir_path), params.pattern, False)
+    )
+    for entry in entries:
+        ext = os.path.splitext(entry.name)[1].lower() or "(nessuna)"
+        total += 1
+        counts[ext] = counts.get(ext, 0) + 1
+        kept = by_ext.setdefault(ext, [])
+        if len(kept) < 20:  # Max 20 per tipo
+            kept.append(entry)
+
+    if not by_ext:
         return f"## 📁 {dir_path.name}\n\nNessun file trovato con pattern: {params.pattern}"
-    
+
     # Formatta output
     output = [
         f"## 📁 {dir_path.name}",
-        f"*{len(files)} file trovati (pattern: {params.pattern})*",
+        f"*{total} file trovati (pattern: {params.pattern})*",
         ""
     ]
-    
-    # Raggruppa per estensione
-    by_ext = {}
-    for f in sorted(files):
-        ext = f.suffix.lower() or "(nessuna)"
-        if ext not in by_ext:
-            by_ext[ext] = []
-        by_ext[ext].append(f)
-    
-    for ext, ext_files in sorted(by_ext.items()):
-        output.append(f"### {ext} ({len(ext_files)})")
-        for f in ext_files[:20]:  # Max 20 per tipo
-            meta = get_file_metadata(f)
-            relative = f.relative_to(dir_path) if params.recursive else f.name
+
+    for ext, ext_entries in sorted(by_ext.items()):
+        output.append(f"### {ext} ({counts[ext]})")
+        for entry in sorted(ext_entries, key=lambda e: e.path):
+            # Riusa lo stat già in cache nel DirEntry (niente syscall extra)
+            meta = get_file_metadata(Path(entry.path), entry.stat())
+            relative = os.path.relpath(entry.path, dir_path) if params.recursive else entry.name
             output.append(f"- `{relative}` ({meta['size_human']})")
-        if len(ext_files) > 20:
-            output.append(f"- ... e altri {len(ext_files) - 20}")
+        if counts[ext] > 20:
+            output.append(f"- ... e altri {counts[ext] - 20}")
         output.append("")
-    
+
     return "\n".join(output)
 
 
@@ -479,46 +1104,55 @@ async def file_reader_extract_structured(params: ExtractTextInput) -> str:
     Returns:
         Testo strutturato con sezioni identificate
     """
-    path = Path(params.file_path).expanduser().resolve()
-    
-    if not path.exists():
+    path = _normalize(params.file_path)
+
+    st = _stat_or_none(path)
+    if st is None:
         return f"## ❌ Errore\n\nFile non trovato: {params.file_path}"
-    
-    metadata = get_file_metadata(path) if params.include_metadata else {}
+
+    metadata = get_file_metadata(path, st) if params.include_metadata else {}
     
     try:
         ext = path.suffix.lower()
-        
+
         if ext == ".pdf":
-            result = read_pdf(path, max_chars=20000)
+            # Per i PDF la struttura (dimensioni font) batte l'euristica
+            # regex sul testo piatto; None se PyMuPDF non è installato
+            if params.extract_sections:
+                structured = await asyncio.to_thread(
+                    _pdf_structured_sections, path
+                )
+                if structured:
+                    return _format_sections_output(
+                        structured,
+                        metadata if params.include_metadata else None
+                    )
+            result = await read_pdf_async(path, max_chars=20000)
             raw_text = result["text"]
         elif ext in [".docx", ".doc"]:
-            result = read_docx(path, max_chars=20000)
+            result = await read_docx_async(path, max_chars=20000)
             raw_text = result["text"]
         else:
-            result = read_text_file(path, max_chars=20000)
+            result = await read_text_file_async(path, max_chars=20000)
             raw_text = result["text"]
         
         # Identifica sezioni (headers)
         if params.extract_sections:
-            import re
-            
             sections = []
             current_section = {"title": "Introduzione", "content": []}
-            
-            for line in raw_text.split("\n"):
-                line = line.strip()
+
+            for m in _LINE_RE.finditer(raw_text):
+                line = m.group().strip()
                 if not line:
                     continue
-                
-                # Pattern per headers (numeri, maiuscole, markdown)
-                is_header = (
-                    re.match(r"^#{1,3}\s+", line) or  # Markdown
-                    re.match(r"^[0-9]+(\.[0-9]+)*\s+[A-Z]", line) or  # 1.2 Title
-                    (len(line) < 100 and line.isupper()) or  # ALL CAPS
-                    re.match(r"^(Chapter|Section|Part)\s+", line, re.I)  # Keywords
+
+                # Pattern per headers (numeri, maiuscole, markdown):
+                # un solo match sull'alternazione precompilata per riga
+                is_header = bool(
+                    _HEADER_RE.match(line) or
+                    (len(line) < 100 and line.isupper())  # ALL CAPS
                 )
-                
+
                 if is_header:
                     if current_section["content"]:
                         sections.append(current_section)
@@ -530,19 +1164,10 @@ async def file_reader_extract_structured(params: ExtractTextInput) -> str:
             if current_section["content"]:
                 sections.append(current_section)
             
-            # Formatta output
-            output = []
-            if params.include_metadata:
-                output.append(f"## 📄 {metadata['name']}")
-                output.append(f"*{metadata['size_human']} | {len(sections)} sezioni identificate*\n")
-            
-            for i, section in enumerate(sections, 1):
-                output.append(f"### {i}. {section['title']}")
-                content = " ".join(section["content"][:500])  # Max 500 parole
-                output.append(f"{content}\n")
-            
-            return "\n".join(output)
-        
+            return _format_sections_output(
+                sections, metadata if params.include_metadata else None
+            )
+
         else:
             return raw_text
             
@@ -555,4 +1180,11 @@ async def file_reader_extract_structured(params: ExtractTextInput) -> str:
 # =============================================================================
 
 if __name__ == "__main__":
+    # Event loop uvloop (C, ~2-4x asyncio su I/O intenso) se installato
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
     mcp.run()
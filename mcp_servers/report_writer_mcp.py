@@ -9,7 +9,9 @@ Supporta:
 Segue le best practices MCP di Anthropic.
 """
 
+import io
 import json
+import re
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, List
@@ -138,180 +140,205 @@ class FormatTextInput(BaseModel):
 # Helper Functions
 # =============================================================================
 
+# Serializzazione JSON: orjson (C, 3-10x stdlib, emette bytes già UTF-8)
+# quando installato, fallback trasparente su json. Il server resta
+# standalone: niente import dal resto del progetto.
+try:
+    import orjson
+
+    def _json_dumps_bytes(obj) -> bytes:
+        return orjson.dumps(
+            obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        )
+
+except ImportError:
+
+    def _json_dumps_bytes(obj) -> bytes:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+# Sanitizzazione titolo → nome file: una sub C-level al posto del loop
+# Python carattere per carattere. \w (Unicode) + spazio + trattino
+# replica esattamente il vecchio filtro isalnum()/" -_"
+_SAFE_NAME = re.compile(r"[^\w \-]")
+
+# Conteggio parole senza materializzare la lista di split()
+_WORD_RE = re.compile(r"\S+")
+
+# Newline → stacco di paragrafo HTML in un solo passaggio C; \n+ evita
+# anche i <p></p> vuoti che la replace char-per-char produceva sulle
+# righe vuote
+_PARA_RE = re.compile(r"\n+")
+
+# Estensioni per formato: dict costruito una volta, non a ogni filename
+_EXT_MAP = {
+    ReportFormat.MARKDOWN: "md",
+    ReportFormat.HTML: "html",
+    ReportFormat.JSON: "json"
+}
+
+# Blocco <style> statico dei report HTML, precomposto a import time
+_HTML_STYLE = (
+    "  <style>\n"
+    "    body { font-family: Arial, sans-serif; max-width: 800px; margin: 0 auto; padding: 20px; }\n"
+    "    h1 { color: #2c3e50; border-bottom: 2px solid #3498db; padding-bottom: 10px; }\n"
+    "    h2 { color: #34495e; margin-top: 30px; }\n"
+    "    .meta { color: #7f8c8d; font-style: italic; }\n"
+    "    .summary { background: #f8f9fa; padding: 15px; border-left: 4px solid #3498db; margin: 20px 0; }\n"
+    "    .toc { background: #ecf0f1; padding: 15px; margin: 20px 0; }\n"
+    "    .toc a { color: #2980b9; text-decoration: none; }\n"
+    "    .toc a:hover { text-decoration: underline; }\n"
+    "    hr { border: none; border-top: 1px solid #bdc3c7; margin: 30px 0; }\n"
+    "    footer { color: #95a5a6; font-size: 0.9em; margin-top: 40px; }\n"
+    "  </style>\n"
+    "</head>\n"
+    "<body>\n"
+)
+
+
 def ensure_output_dir():
     """Assicura che la directory di output esista."""
     DEFAULT_OUTPUT_DIR.mkdir(exist_ok=True)
     return DEFAULT_OUTPUT_DIR
 
 
-def generate_filename(title: str, format: ReportFormat) -> str:
+def generate_filename(title: str, format: ReportFormat,
+                      now: Optional[datetime] = None) -> str:
     """Genera un nome file dal titolo."""
     # Pulisci titolo
-    clean_title = "".join(c if c.isalnum() or c in " -_" else "" for c in title)
-    clean_title = clean_title.strip().replace(" ", "_")[:50]
-    
-    # Aggiungi timestamp
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    
-    # Estensione
-    ext_map = {
-        ReportFormat.MARKDOWN: "md",
-        ReportFormat.HTML: "html",
-        ReportFormat.JSON: "json"
-    }
-    
-    return f"{clean_title}_{timestamp}.{ext_map[format]}"
+    clean_title = _SAFE_NAME.sub("", title).strip().replace(" ", "_")[:50]
+
+    # Aggiungi timestamp (riusa l'istante del chiamante se fornito, così
+    # nome file e footer del report riportano lo stesso momento)
+    timestamp = (now or datetime.now()).strftime("%Y%m%d_%H%M%S")
 
+    return f"{clean_title}_{timestamp}.{_EXT_MAP[format]}"
 
-def sections_to_markdown(title: str, sections: List[ReportSection], 
-                         author: str, summary: Optional[str]) -> str:
+
+def sections_to_markdown(title: str, sections: List[ReportSection],
+                         author: str, summary: Optional[str],
+                         now: Optional[datetime] = None) -> str:
     """Converte sezioni in Markdown."""
-    lines = [
-        f"# {title}",
-        "",
-        f"*Autore: {author}*  ",
-        f"*Data: {datetime.now().strftime('%d/%m/%Y %H:%M')}*",
-        "",
-        "---",
-        ""
-    ]
-    
+    # Un solo datetime.now() per report: header e footer coerenti,
+    # niente clock_gettime ripetuti
+    now = now or datetime.now()
+
+    # StringIO + write per blocco: niente lista di decine di stringhe
+    # da riallocare e poi rifondere con un join finale
+    buf = io.StringIO()
+    buf.write(
+        f"# {title}\n\n"
+        f"*Autore: {author}*  \n"
+        f"*Data: {now.strftime('%d/%m/%Y %H:%M')}*\n\n"
+        "---\n\n"
+    )
+
     if summary:
-        lines.extend([
-            "## Executive Summary",
-            "",
-            summary,
-            "",
-            "---",
-            ""
-        ])
-    
+        buf.write(f"## Executive Summary\n\n{summary}\n\n---\n\n")
+
     # Indice
-    lines.extend([
-        "## Indice",
-        ""
-    ])
+    buf.write("## Indice\n\n")
     for i, section in enumerate(sections, 1):
         anchor = section.title.lower().replace(" ", "-")
-        lines.append(f"{i}. [{section.title}](#{anchor})")
-    lines.extend(["", "---", ""])
-    
+        buf.write(f"{i}. [{section.title}](#{anchor})\n")
+    buf.write("\n---\n\n")
+
     # Sezioni
     for section in sections:
         heading = "#" * section.level
-        lines.extend([
-            f"{heading} {section.title}",
-            "",
-            section.content,
-            "",
-            ""
-        ])
-    
+        buf.write(f"{heading} {section.title}\n\n{section.content}\n\n\n")
+
     # Footer
-    lines.extend([
-        "---",
-        "",
-        f"*Report generato automaticamente - {datetime.now().isoformat()}*"
-    ])
-    
-    return "\n".join(lines)
+    buf.write(f"---\n\n*Report generato automaticamente - {now.isoformat()}*")
+
+    return buf.getvalue()
 
 
 def sections_to_html(title: str, sections: List[ReportSection],
-                    author: str, summary: Optional[str]) -> str:
+                    author: str, summary: Optional[str],
+                    now: Optional[datetime] = None) -> str:
     """Converte sezioni in HTML."""
-    html_parts = [
-        "<!DOCTYPE html>",
-        "<html lang='it'>",
-        "<head>",
-        f"  <title>{title}</title>",
-        "  <meta charset='UTF-8'>",
-        "  <style>",
-        "    body { font-family: Arial, sans-serif; max-width: 800px; margin: 0 auto; padding: 20px; }",
-        "    h1 { color: #2c3e50; border-bottom: 2px solid #3498db; padding-bottom: 10px; }",
-        "    h2 { color: #34495e; margin-top: 30px; }",
-        "    .meta { color: #7f8c8d; font-style: italic; }",
-        "    .summary { background: #f8f9fa; padding: 15px; border-left: 4px solid #3498db; margin: 20px 0; }",
-        "    .toc { background: #ecf0f1; padding: 15px; margin: 20px 0; }",
-        "    .toc a { color: #2980b9; text-decoration: none; }",
-        "    .toc a:hover { text-decoration: underline; }",
-        "    hr { border: none; border-top: 1px solid #bdc3c7; margin: 30px 0; }",
-        "    footer { color: #95a5a6; font-size: 0.9em; margin-top: 40px; }",
-        "  </style>",
-        "</head>",
-        "<body>",
-        f"  <h1>{title}</h1>",
-        f"  <p class='meta'>Autore: {author} | Data: {datetime.now().strftime('%d/%m/%Y %H:%M')}</p>",
-        "  <hr>"
-    ]
-    
+    now = now or datetime.now()
+
+    buf = io.StringIO()
+    buf.write(
+        "<!DOCTYPE html>\n"
+        "<html lang='it'>\n"
+        "<head>\n"
+        f"  <title>{title}</title>\n"
+        "  <meta charset='UTF-8'>\n"
+    )
+    buf.write(_HTML_STYLE)
+    buf.write(
+        f"  <h1>{title}</h1>\n"
+        f"  <p class='meta'>Autore: {author} | Data: {now.strftime('%d/%m/%Y %H:%M')}</p>\n"
+        "  <hr>\n"
+    )
+
     if summary:
-        html_parts.extend([
-            "  <div class='summary'>",
-            "    <h2>Executive Summary</h2>",
-            f"    <p>{summary}</p>",
-            "  </div>"
-        ])
-    
+        buf.write(
+            "  <div class='summary'>\n"
+            "    <h2>Executive Summary</h2>\n"
+            f"    <p>{summary}</p>\n"
+            "  </div>\n"
+        )
+
+    # Anchor calcolate una volta sola: servono sia nel TOC sia negli id
+    # delle sezioni, inutile rifare lower+replace due volte per titolo
+    anchors = [s.title.lower().replace(" ", "-") for s in sections]
+
     # TOC
-    html_parts.extend([
-        "  <div class='toc'>",
-        "    <h2>Indice</h2>",
-        "    <ol>"
-    ])
-    for section in sections:
-        anchor = section.title.lower().replace(" ", "-")
-        html_parts.append(f"      <li><a href='#{anchor}'>{section.title}</a></li>")
-    html_parts.extend([
-        "    </ol>",
-        "  </div>",
-        "  <hr>"
-    ])
-    
+    buf.write("  <div class='toc'>\n    <h2>Indice</h2>\n    <ol>\n")
+    for section, anchor in zip(sections, anchors):
+        buf.write(f"      <li><a href='#{anchor}'>{section.title}</a></li>\n")
+    buf.write("    </ol>\n  </div>\n  <hr>\n")
+
     # Sections
-    for section in sections:
-        anchor = section.title.lower().replace(" ", "-")
+    for section, anchor in zip(sections, anchors):
         tag = f"h{section.level}"
-        html_parts.extend([
-            f"  <{tag} id='{anchor}'>{section.title}</{tag}>",
-            f"  <p>{section.content.replace(chr(10), '</p><p>')}</p>",
-            ""
-        ])
-    
+        buf.write(
+            f"  <{tag} id='{anchor}'>{section.title}</{tag}>\n"
+            f"  <p>{_PARA_RE.sub('</p><p>', section.content)}</p>\n\n"
+        )
+
     # Footer
-    html_parts.extend([
-        "  <hr>",
-        f"  <footer>Report generato automaticamente - {datetime.now().isoformat()}</footer>",
-        "</body>",
+    buf.write(
+        "  <hr>\n"
+        f"  <footer>Report generato automaticamente - {now.isoformat()}</footer>\n"
+        "</body>\n"
         "</html>"
-    ])
-    
-    return "\n".join(html_parts)
+    )
+
+    return buf.getvalue()
 
 
 def sections_to_json(title: str, sections: List[ReportSection],
-                    author: str, summary: Optional[str]) -> str:
+                    author: str, summary: Optional[str],
+                    now: Optional[datetime] = None) -> str:
     """Converte sezioni in JSON strutturato."""
+    # Un solo passaggio per sezione: il conteggio serve sia nel dict
+    # per-sezione sia nel totale, e finditer non alloca la lista di split()
+    counts = [sum(1 for _ in _WORD_RE.finditer(s.content)) for s in sections]
     data = {
         "report": {
             "title": title,
             "author": author,
-            "generated_at": datetime.now().isoformat(),
+            "generated_at": (now or datetime.now()).isoformat(),
             "summary": summary,
             "sections": [
                 {
                     "title": s.title,
                     "level": s.level,
                     "content": s.content,
-                    "word_count": len(s.content.split())
+                    "word_count": count
                 }
-                for s in sections
+                for s, count in zip(sections, counts)
             ],
             "total_sections": len(sections),
-            "total_words": sum(len(s.content.split()) for s in sections)
+            "total_words": sum(counts)
         }
     }
-    return json.dumps(data, indent=2, ensure_ascii=False)
+    return _json_dumps_bytes(data).decode("utf-8")
 
 
 # =============================================================================
@@ -343,31 +370,35 @@ async def report_writer_create(params: CreateReportInput) -> str:
     """
     try:
         output_dir = ensure_output_dir()
-        
+
+        # Stesso istante per contenuto e nome file
+        now = datetime.now()
+
         # Genera contenuto in base al formato
         if params.format == ReportFormat.MARKDOWN:
             content = sections_to_markdown(
-                params.title, params.sections, params.author, params.summary
+                params.title, params.sections, params.author, params.summary, now
             )
         elif params.format == ReportFormat.HTML:
             content = sections_to_html(
-                params.title, params.sections, params.author, params.summary
+                params.title, params.sections, params.author, params.summary, now
             )
         else:  # JSON
             content = sections_to_json(
-                params.title, params.sections, params.author, params.summary
+                params.title, params.sections, params.author, params.summary, now
             )
-        
+
         # Determina percorso output
         if params.output_path:
             output_path = Path(params.output_path)
         else:
-            filename = generate_filename(params.title, params.format)
+            filename = generate_filename(params.title, params.format, now)
             output_path = output_dir / filename
         
-        # Scrivi file
+        # Scrivi file: un solo passaggio di encode e una write unica,
+        # senza il buffering a chunk del layer testo
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_text(content, encoding="utf-8")
+        output_path.write_bytes(content.encode("utf-8"))
         
         return (
             f"## ✅ Report Creato\n\n"
@@ -408,23 +439,32 @@ async def report_writer_append(params: AppendToReportInput) -> str:
         return f"## ❌ Errore\n\nFile non trovato: {params.file_path}"
     
     try:
-        # Leggi contenuto esistente
-        existing = path.read_text(encoding="utf-8")
-        
         # Prepara nuova sezione
         heading = "#" * params.section.level
         new_section = f"\n\n{heading} {params.section.title}\n\n{params.section.content}"
-        
-        # Trova posizione prima del footer (se presente)
-        footer_marker = "---\n\n*Report generato"
-        if footer_marker in existing:
-            parts = existing.rsplit(footer_marker, 1)
-            updated = parts[0] + new_section + "\n\n" + footer_marker + parts[1]
-        else:
-            updated = existing + new_section
-        
-        # Scrivi
-        path.write_text(updated, encoding="utf-8")
+        section_bytes = new_section.encode("utf-8")
+
+        # Il footer è un marker fisso in coda al file: basta leggere gli
+        # ultimi KB e riscrivere sezione + footer in place, invece di
+        # rileggere e riscrivere l'intero report a ogni append
+        footer_marker = b"---\n\n*Report generato"
+        with path.open("r+b") as f:
+            f.seek(0, 2)
+            size = f.tell()
+            tail_start = max(0, size - 8192)
+            f.seek(tail_start)
+            tail = f.read()
+
+            idx = tail.rfind(footer_marker)
+            if idx >= 0:
+                # Splice: nuova sezione al posto del footer, poi il
+                # footer riscritto dopo (il file può solo crescere)
+                footer = tail[idx:]
+                f.seek(tail_start + idx)
+                f.write(section_bytes + b"\n\n" + footer)
+            else:
+                f.seek(0, 2)
+                f.write(section_bytes)
         
         return (
             f"## ✅ Sezione Aggiunta\n\n"
@@ -474,10 +514,8 @@ async def report_writer_export_data(params: ExportDataInput) -> str:
         filename = f"{params.filename}.json"
         output_path = output_dir / filename
         
-        output_path.write_text(
-            json.dumps(export_data, indent=2, ensure_ascii=False),
-            encoding="utf-8"
-        )
+        # Bytes diretti su disco: salta il re-encode UTF-8 di write_text
+        output_path.write_bytes(_json_dumps_bytes(export_data))
         
         return (
             f"## ✅ Dati Esportati\n\n"
@@ -516,7 +554,6 @@ async def report_writer_format_text(params: FormatTextInput) -> str:
     
     if params.as_list:
         # Divide per frasi/righe e crea lista
-        import re
         items = re.split(r'[.;\n]', text)
         items = [item.strip() for item in items if item.strip()]
         formatted = "\n".join(f"- {item}" for item in items)
@@ -557,4 +594,11 @@ async def report_writer_format_text(params: FormatTextInput) -> str:
 # =============================================================================
 
 if __name__ == "__main__":
+    # Event loop uvloop (C, ~2-4x asyncio su I/O intenso) se installato
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
     mcp.run()
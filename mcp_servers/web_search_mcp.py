@@ -9,17 +9,28 @@ Questo server espone tool per:
 Segue le best practices MCP di Anthropic.
 """
 
+import io
 import json
 import asyncio
+import hashlib
+import re
+import time
+from collections import OrderedDict
 from datetime import datetime
 from typing import Optional, List
 from enum import Enum
+from urllib.parse import urlsplit, urlunsplit
 
 from mcp.server.fastmcp import FastMCP
 from pydantic import BaseModel, Field, ConfigDict
 import httpx
 from ddgs import DDGS
 
+try:
+    from ddgs.exceptions import DDGSException
+except ImportError:  # versioni del pacchetto senza modulo exceptions
+    DDGSException = Exception
+
 # =============================================================================
 # Server Initialization
 # =============================================================================
@@ -109,89 +120,379 @@ class FetchPageInput(BaseModel):
     )
 
 
+class FetchPagesInput(BaseModel):
+    """Input per fetch di più pagine web in parallelo."""
+    model_config = ConfigDict(str_strip_whitespace=True, extra="forbid")
+
+    urls: List[str] = Field(
+        ...,
+        description="Lista di URL da recuperare (max 20)",
+        min_length=1,
+        max_length=20
+    )
+    max_length: int = Field(
+        default=5000,
+        description="Lunghezza massima del testo estratto per pagina",
+        ge=100,
+        le=50000
+    )
+
+
 # =============================================================================
 # Helper Functions
 # =============================================================================
 
+# Serializzazione JSON: orjson (parser C, 3-10x stdlib) quando installato,
+# fallback trasparente su json. Il server resta standalone: niente import
+# dal resto del progetto.
+try:
+    import orjson
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+
+except ImportError:
+
+    def _json_dumps(obj) -> str:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+
+
+# Messaggi errore dei tool: f-string ricostruite solo sul percorso
+# d'errore, i prefissi vivono qui
+_ERR_SEARCH = "Errore durante la ricerca"
+_ERR_NEWS = "Errore durante la ricerca news"
+_ERR_TIMEOUT = "Timeout durante la richiesta"
+_ERR_UNEXPECTED = "Errore inatteso"
+
+
+def _search_error(error_msg: str, p: dict) -> str:
+    """Risposta d'errore nel formato richiesto dal chiamante."""
+    if p["response_format"] == ResponseFormat.JSON:
+        return _json_dumps({"error": error_msg, "query": p["query"]})
+    return f"## ❌ Errore\n\n{error_msg}"
+
+
+# Cache in-process dei risultati dei tool: le stesse query arrivano più
+# volte nella stessa sessione (retry dell'LLM, fasi diverse del workflow)
+# e una ricerca DuckDuckGo costa 1-3 secondi di rete. LRU con TTL, più un
+# lock per chiave che evita fetch duplicate concorrenti (stampede)
+_CACHE_TTL = 3600  # secondi
+_CACHE_MAX = 512
+_tool_cache: "OrderedDict[str, tuple[float, str]]" = OrderedDict()
+_cache_locks: dict = {}
+
+
+def _cache_key(tool: str, params: dict) -> str:
+    """Chiave compatta da nome tool + parametri già dumpati."""
+    raw = tool + "|" + repr(sorted(params.items()))
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _cache_get(key: str) -> Optional[str]:
+    """Valore in cache se presente e non scaduto, altrimenti None."""
+    entry = _tool_cache.get(key)
+    if entry is not None:
+        expires, value = entry
+        if time.time() < expires:
+            _tool_cache.move_to_end(key)
+            return value
+        del _tool_cache[key]
+    return None
+
+
+def _cache_put(key: str, value: str) -> None:
+    """Inserisce un valore con scadenza, scartando i meno recenti."""
+    _tool_cache[key] = (time.time() + _CACHE_TTL, value)
+    _tool_cache.move_to_end(key)
+    while len(_tool_cache) > _CACHE_MAX:
+        _tool_cache.popitem(last=False)
+
+
+def _cache_lock(key: str) -> asyncio.Lock:
+    """Lock per chiave: richieste identiche concorrenti ne eseguono una."""
+    lock = _cache_locks.get(key)
+    if lock is None:
+        lock = _cache_locks.setdefault(key, asyncio.Lock())
+        if len(_cache_locks) > _CACHE_MAX:
+            for k in [k for k, v in _cache_locks.items() if not v.locked()]:
+                del _cache_locks[k]
+    return lock
+
+# Client HTTP condiviso a livello di processo: pool keep-alive e handshake
+# TLS riusati tra fetch consecutivi verso lo stesso host, con un semaforo
+# che limita le fetch concorrenti
+_http_client: Optional[httpx.AsyncClient] = None
+_fetch_sem = asyncio.Semaphore(8)
+
+_DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (compatible; ResearchAssistant/1.0)"
+}
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Restituisce il client httpx condiviso, creandolo al primo uso."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            follow_redirects=True,
+            timeout=15,
+            headers=_DEFAULT_HEADERS,
+            limits=httpx.Limits(
+                max_connections=32,
+                max_keepalive_connections=16,
+                keepalive_expiry=30
+            )
+        )
+    return _http_client
+
+
+def _ddgs_text(query: str, region: str, max_results: int) -> List[dict]:
+    """Ricerca DDGS sincrona, da eseguire in un thread worker.
+
+    Il client ddgs è bloccante: eseguito direttamente nell'handler
+    fermerebbe l'event loop (e quindi ogni altro tool) per l'intera
+    durata della richiesta di rete.
+    """
+    with DDGS() as ddgs:
+        return list(ddgs.text(query, region=region, max_results=max_results))
+
+
+def _ddgs_news(query: str, max_results: int, timelimit: Optional[str]) -> List[dict]:
+    """Ricerca news DDGS sincrona, da eseguire in un thread worker."""
+    with DDGS() as ddgs:
+        return list(ddgs.news(query, max_results=max_results, timelimit=timelimit))
+
+
 def format_search_results_markdown(results: List[dict], query: str) -> str:
     """Formatta risultati di ricerca in Markdown."""
     if not results:
         return f"## Nessun risultato per: {query}\n\nProva con termini diversi."
-    
-    output = [f"## Risultati per: {query}\n"]
-    output.append(f"*{len(results)} risultati trovati*\n")
-    
+
+    # Scrittura a blocchi su StringIO invece di lista+join: un buffer
+    # unico, niente lista intermedia di frammenti (output identico)
+    buf = io.StringIO()
+    buf.write(f"## Risultati per: {query}\n\n*{len(results)} risultati trovati*\n\n")
+
     for i, r in enumerate(results, 1):
         title = r.get("title", "Senza titolo")
         url = r.get("href", r.get("link", "#"))
         snippet = r.get("body", r.get("snippet", ""))
-        
-        output.append(f"### {i}. {title}")
-        output.append(f"🔗 {url}")
+
+        buf.write(f"### {i}. {title}\n🔗 {url}\n")
         if snippet:
-            output.append(f"\n{snippet}\n")
-        output.append("")
-    
-    return "\n".join(output)
+            buf.write(f"\n{snippet}\n\n")
+        buf.write("\n")
+
+    # Il join originale non aveva newline dopo l'ultimo elemento
+    return buf.getvalue()[:-1]
 
 
 def format_news_results_markdown(results: List[dict], query: str) -> str:
     """Formatta risultati news in Markdown."""
     if not results:
         return f"## Nessuna news per: {query}\n"
-    
-    output = [f"## 📰 News: {query}\n"]
-    output.append(f"*{len(results)} articoli trovati*\n")
-    
+
+    buf = io.StringIO()
+    buf.write(f"## 📰 News: {query}\n\n*{len(results)} articoli trovati*\n\n")
+
     for i, r in enumerate(results, 1):
         title = r.get("title", "Senza titolo")
         url = r.get("url", r.get("link", "#"))
         date = r.get("date", "")
         source = r.get("source", "")
         snippet = r.get("body", "")
-        
-        output.append(f"### {i}. {title}")
+
+        buf.write(f"### {i}. {title}\n")
         if source or date:
             meta = " | ".join(filter(None, [source, date]))
-            output.append(f"*{meta}*")
-        output.append(f"🔗 {url}")
+            buf.write(f"*{meta}*\n")
+        buf.write(f"🔗 {url}\n")
         if snippet:
-            output.append(f"\n{snippet}\n")
-        output.append("")
-    
-    return "\n".join(output)
+            buf.write(f"\n{snippet}\n\n")
+        buf.write("\n")
+
+    return buf.getvalue()[:-1]
+
+
+# Tag il cui contenuto non è testo utile per la ricerca
+_SKIP_TAGS = frozenset({"script", "style", "nav", "footer", "header", "aside"})
+
+# Spazi a fine riga + newline + righe vuote/indentazione successiva:
+# un'unica sub equivale al vecchio split/strip/filter/join per riga
+_COLLAPSE = re.compile(r"[^\S\n]*\n\s*")
+
+
+def _html_to_text_lxml(html: bytes, max_chars: int) -> str:
+    """Estrazione testo in streaming con il pull parser di lxml.
+
+    Un solo passaggio sugli eventi start/end: niente albero bs4 da
+    costruire e da ripulire, e l'iterazione si ferma appena il testo
+    raccolto supera max_chars (la troncatura avviene comunque a valle).
+    """
+    from lxml import etree
+
+    parser = etree.HTMLPullParser(events=("start", "end"))
+    parser.feed(html)
+    parser.close()
+
+    buf = io.StringIO()
+    written = 0
+    skip_depth = 0
+    for event, elem in parser.read_events():
+        tag = elem.tag if isinstance(elem.tag, str) else ""
+        if event == "start":
+            if tag in _SKIP_TAGS:
+                skip_depth += 1
+            elif skip_depth == 0 and elem.text:
+                text = elem.text.strip()
+                if text:
+                    buf.write(text)
+                    buf.write("\n")
+                    written += len(text) + 1
+        else:
+            if tag in _SKIP_TAGS:
+                skip_depth -= 1
+            # Il tail è il testo dopo il tag di chiusura: appartiene al
+            # genitore, quindi conta solo se fuori dai sottoalberi skip
+            if skip_depth == 0 and elem.tail:
+                text = elem.tail.strip()
+                if text:
+                    buf.write(text)
+                    buf.write("\n")
+                    written += len(text) + 1
+        if written > max_chars:
+            break
+
+    return buf.getvalue()
+
+
+def _html_to_text(html: bytes, max_chars: int) -> str:
+    """Estrae il testo visibile da un documento HTML.
+
+    Usa selectolax (parser Lexbor in C, molto più veloce) se installato,
+    poi il pull parser di lxml, con BeautifulSoup come ultima spiaggia.
+    """
+    try:
+        from selectolax.lexbor import LexborHTMLParser
+    except ImportError:
+        LexborHTMLParser = None
+
+    if LexborHTMLParser is not None:
+        tree = LexborHTMLParser(html)
+        for tag in _SKIP_TAGS:
+            for node in tree.tags(tag):
+                node.decompose()
+        body = tree.body
+        if body is not None:
+            return body.text(separator="\n", strip=True)
+        return tree.text(separator="\n", strip=True)
+
+    try:
+        return _html_to_text_lxml(html, max_chars)
+    except ImportError:
+        pass
+
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "lxml")
+
+    # Rimuovi script, style, nav, footer
+    for tag in soup(list(_SKIP_TAGS)):
+        tag.decompose()
+
+    return soup.get_text(separator="\n", strip=True)
+
+
+async def _fetch_body(url: str, max_bytes: int, headers: Optional[dict] = None) -> bytes:
+    """Scarica il body di una pagina in streaming, fermandosi a max_bytes.
+
+    Per pagine molto grandi evita di scaricare (e tenere in memoria)
+    megabyte di HTML quando a valle ne verranno usati solo i primi
+    max_length caratteri.
+    """
+    async with _fetch_sem:
+        client = _get_http_client()
+        async with client.stream("GET", url, headers=headers) as response:
+            response.raise_for_status()
+            buf = bytearray()
+            async for chunk in response.aiter_bytes(65536):
+                buf.extend(chunk)
+                if len(buf) >= max_bytes:
+                    break
+    return bytes(buf)
 
 
 async def extract_page_text(url: str, max_length: int = 5000) -> str:
     """Estrae testo da una pagina web."""
-    from bs4 import BeautifulSoup
-    
-    headers = {
-        "User-Agent": "Mozilla/5.0 (compatible; ResearchAssistant/1.0)"
-    }
-    
-    async with httpx.AsyncClient(follow_redirects=True, timeout=15) as client:
-        response = await client.get(url, headers=headers)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.text, "lxml")
-        
-        # Rimuovi script, style, nav, footer
-        for tag in soup(["script", "style", "nav", "footer", "header", "aside"]):
-            tag.decompose()
-        
-        # Estrai testo
-        text = soup.get_text(separator="\n", strip=True)
-        
-        # Pulisci linee vuote multiple
-        lines = [line.strip() for line in text.split("\n") if line.strip()]
-        text = "\n".join(lines)
-        
-        # Tronca se necessario
-        if len(text) > max_length:
-            text = text[:max_length] + "\n\n[... contenuto troncato ...]"
-        
-        return text
+    # Margine 4x: il markup viene scartato dal parser, quindi servono
+    # più byte di HTML per ottenere max_length caratteri di testo
+    body = await _fetch_body(url, max_length * 4)
+
+    text = _html_to_text(body, max_length)
+
+    # Pulisci spazi di riga e linee vuote multiple
+    text = _COLLAPSE.sub("\n", text).strip()
+
+    # Tronca se necessario
+    if len(text) > max_length:
+        text = text[:max_length] + "\n\n[... contenuto troncato ...]"
+
+    return text
+
+
+# Parametri di tracking ignorati nella normalizzazione degli URL
+_TRACKING_PREFIXES = ("utm_", "fbclid", "gclid", "mc_cid", "mc_eid")
+
+
+def _canonical_url(url: str) -> str:
+    """URL canonico per il dedup: niente fragment né parametri di tracking."""
+    parts = urlsplit(url)
+    query = "&".join(
+        p for p in parts.query.split("&")
+        if p and not p.startswith(_TRACKING_PREFIXES)
+    )
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, query, ""))
+
+
+async def extract_pages_bulk(urls: List[str], max_length: int = 5000) -> List[dict]:
+    """Estrae il testo da più pagine in parallelo.
+
+    Gli URL vengono prima deduplicati in forma canonica (fragment e
+    parametri di tracking esclusi): gli stessi articoli arrivano spesso
+    da ricerche diverse con solo gli utm_ a cambiare. Le fetch partono
+    tutte insieme (la concorrenza effettiva è limitata dal semaforo
+    condiviso) e ogni errore resta confinato alla sua URL: una pagina
+    irraggiungibile non fa fallire le altre.
+
+    Args:
+        urls: URL da recuperare
+        max_length: Lunghezza massima del testo estratto per pagina
+
+    Returns:
+        Una voce per URL unico, nell'ordine di prima apparizione:
+        {"url", "success", "content"} oppure {"url", "success", "error"}
+    """
+    seen: set = set()
+    unique: List[str] = []
+    for url in urls:
+        # urlsplit alza ValueError su URL malformati (arrivano dal LLM):
+        # dedup sulla stringa grezza, l'errore emerge poi in fetch_one
+        try:
+            key = _canonical_url(url)
+        except ValueError:
+            key = url
+        if key not in seen:
+            seen.add(key)
+            unique.append(url)
+
+    async def fetch_one(url: str) -> dict:
+        try:
+            text = await extract_page_text(url, max_length)
+            return {"url": url, "success": True, "content": text}
+        except Exception as e:
+            return {"url": url, "success": False, "error": str(e)}
+
+    return list(await asyncio.gather(*(fetch_one(u) for u in unique)))
 
 
 # =============================================================================
@@ -221,29 +522,42 @@ async def web_search_query(params: WebSearchInput) -> str:
     Returns:
         Risultati di ricerca in formato markdown o JSON
     """
-    try:
-        with DDGS() as ddgs:
-            results = list(ddgs.text(
-                params.query,
-                region=params.region,
-                max_results=params.max_results
-            ))
-        
-        if params.response_format == ResponseFormat.JSON:
-            return json.dumps({
-                "query": params.query,
-                "count": len(results),
-                "results": results,
-                "timestamp": datetime.now().isoformat()
-            }, indent=2, ensure_ascii=False)
-        else:
-            return format_search_results_markdown(results, params.query)
-            
-    except Exception as e:
-        error_msg = f"Errore durante la ricerca: {str(e)}"
-        if params.response_format == ResponseFormat.JSON:
-            return json.dumps({"error": error_msg, "query": params.query})
-        return f"## ❌ Errore\n\n{error_msg}"
+    # Un solo model_dump: l'accesso agli attributi pydantic passa per
+    # __getattr__ e ripetuto costa più di un accesso dict
+    p = params.model_dump()
+    key = _cache_key("web_search_query", p)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+
+    async with _cache_lock(key):
+        cached = _cache_get(key)
+        if cached is not None:
+            return cached
+
+        try:
+            results = await asyncio.to_thread(
+                _ddgs_text, p["query"], p["region"], p["max_results"]
+            )
+
+            if p["response_format"] == ResponseFormat.JSON:
+                output = _json_dumps({
+                    "query": p["query"],
+                    "count": len(results),
+                    "results": results,
+                    "timestamp": datetime.now().isoformat()
+                })
+            else:
+                output = format_search_results_markdown(results, p["query"])
+
+            _cache_put(key, output)
+            return output
+
+        except (DDGSException, httpx.TimeoutException) as e:
+            return _search_error(f"{_ERR_SEARCH}: {str(e)}", p)
+        except Exception as e:
+            # Un tool MCP non deve mai propagare eccezioni al client
+            return _search_error(f"{_ERR_UNEXPECTED}: {str(e)}", p)
 
 
 @mcp.tool(
@@ -269,30 +583,41 @@ async def web_search_news(params: NewsSearchInput) -> str:
     Returns:
         News in formato markdown o JSON con titolo, fonte, data, URL
     """
-    try:
-        with DDGS() as ddgs:
-            results = list(ddgs.news(
-                params.query,
-                max_results=params.max_results,
-                timelimit=params.timelimit
-            ))
-        
-        if params.response_format == ResponseFormat.JSON:
-            return json.dumps({
-                "query": params.query,
-                "count": len(results),
-                "timelimit": params.timelimit,
-                "results": results,
-                "timestamp": datetime.now().isoformat()
-            }, indent=2, ensure_ascii=False)
-        else:
-            return format_news_results_markdown(results, params.query)
-            
-    except Exception as e:
-        error_msg = f"Errore durante la ricerca news: {str(e)}"
-        if params.response_format == ResponseFormat.JSON:
-            return json.dumps({"error": error_msg, "query": params.query})
-        return f"## ❌ Errore\n\n{error_msg}"
+    p = params.model_dump()
+    key = _cache_key("web_search_news", p)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+
+    async with _cache_lock(key):
+        cached = _cache_get(key)
+        if cached is not None:
+            return cached
+
+        try:
+            results = await asyncio.to_thread(
+                _ddgs_news, p["query"], p["max_results"], p["timelimit"]
+            )
+
+            if p["response_format"] == ResponseFormat.JSON:
+                output = _json_dumps({
+                    "query": p["query"],
+                    "count": len(results),
+                    "timelimit": p["timelimit"],
+                    "results": results,
+                    "timestamp": datetime.now().isoformat()
+                })
+            else:
+                output = format_news_results_markdown(results, p["query"])
+
+            _cache_put(key, output)
+            return output
+
+        except (DDGSException, httpx.TimeoutException) as e:
+            return _search_error(f"{_ERR_NEWS}: {str(e)}", p)
+        except Exception as e:
+            # Un tool MCP non deve mai propagare eccezioni al client
+            return _search_error(f"{_ERR_UNEXPECTED}: {str(e)}", p)
 
 
 @mcp.tool(
@@ -318,21 +643,93 @@ async def web_search_fetch_page(params: FetchPageInput) -> str:
     Returns:
         Contenuto della pagina (testo estratto o HTML)
     """
-    try:
-        if params.extract_text:
-            content = await extract_page_text(params.url, params.max_length)
-            return f"## Contenuto da: {params.url}\n\n{content}"
-        else:
-            async with httpx.AsyncClient(follow_redirects=True, timeout=15) as client:
-                response = await client.get(params.url)
-                response.raise_for_status()
-                html = response.text[:params.max_length]
-                return f"## HTML da: {params.url}\n\n```html\n{html}\n```"
-                
-    except httpx.HTTPStatusError as e:
-        return f"## ❌ Errore HTTP {e.response.status_code}\n\nImpossibile accedere a: {params.url}"
-    except Exception as e:
-        return f"## ❌ Errore\n\n{str(e)}"
+    p = params.model_dump()
+    key = _cache_key("web_search_fetch_page", p)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+
+    async with _cache_lock(key):
+        cached = _cache_get(key)
+        if cached is not None:
+            return cached
+
+        try:
+            if p["extract_text"]:
+                content = await extract_page_text(p["url"], p["max_length"])
+                output = f"## Contenuto da: {p['url']}\n\n{content}"
+            else:
+                body = await _fetch_body(p["url"], p["max_length"])
+                html = body.decode("utf-8", errors="replace")[:p["max_length"]]
+                output = f"## HTML da: {p['url']}\n\n```html\n{html}\n```"
+
+            _cache_put(key, output)
+            return output
+
+        except httpx.TimeoutException:
+            return f"## ❌ {_ERR_TIMEOUT}\n\nImpossibile accedere a: {p['url']}"
+        except httpx.HTTPStatusError as e:
+            return f"## ❌ Errore HTTP {e.response.status_code}\n\nImpossibile accedere a: {p['url']}"
+        except Exception as e:
+            # Un tool MCP non deve mai propagare eccezioni al client
+            return f"## ❌ {_ERR_UNEXPECTED}\n\n{str(e)}"
+
+
+@mcp.tool(
+    name="web_search_fetch_pages",
+    annotations={
+        "title": "Fetch Web Pages (bulk)",
+        "readOnlyHint": True,
+        "destructiveHint": False,
+        "idempotentHint": True,
+        "openWorldHint": True
+    }
+)
+async def web_search_fetch_pages(params: FetchPagesInput) -> str:
+    """
+    Recupera e estrae il testo di più pagine web in parallelo.
+
+    Molto più veloce di chiamate ripetute a web_search_fetch_page quando
+    si devono approfondire più risultati di ricerca: le pagine vengono
+    scaricate in concorrenza e gli errori restano per-URL.
+
+    Args:
+        params: FetchPagesInput con urls e max_length
+
+    Returns:
+        Testo estratto per ogni pagina, con una sezione per URL
+    """
+    p = params.model_dump()
+    key = _cache_key("web_search_fetch_pages", p)
+    cached = _cache_get(key)
+    if cached is not None:
+        return cached
+
+    async with _cache_lock(key):
+        cached = _cache_get(key)
+        if cached is not None:
+            return cached
+
+        try:
+            pages = await extract_pages_bulk(p["urls"], p["max_length"])
+
+            buf = io.StringIO()
+            ok = sum(1 for page in pages if page["success"])
+            buf.write(f"# Contenuti da {len(pages)} pagine ({ok} recuperate)\n\n")
+            for page in pages:
+                if page["success"]:
+                    buf.write(f"## Contenuto da: {page['url']}\n\n{page['content']}\n\n---\n\n")
+                else:
+                    buf.write(f"## ❌ Errore per: {page['url']}\n\n{page['error']}\n\n---\n\n")
+
+            output = buf.getvalue()
+            if ok:
+                _cache_put(key, output)
+            return output
+
+        except Exception as e:
+            # Un tool MCP non deve mai propagare eccezioni al client
+            return f"## ❌ {_ERR_UNEXPECTED}\n\n{str(e)}"
 
 
 # =============================================================================
@@ -340,5 +737,12 @@ async def web_search_fetch_page(params: FetchPageInput) -> str:
 # =============================================================================
 
 if __name__ == "__main__":
+    # Event loop uvloop (C, ~2-4x asyncio su I/O intenso) se installato
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
     # Avvia server MCP con stdio transport (per uso locale)
     mcp.run()
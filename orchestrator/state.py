@@ -5,10 +5,21 @@ Definisce la struttura dello stato condiviso tra gli agenti
 durante l'esecuzione di un task.
 """
 
+import time
 from typing import Any, Dict, List, Optional, TypedDict, Annotated
 from datetime import datetime
 from enum import Enum
-import operator
+
+
+def extend_list(left: List, right: List) -> List:
+    """Reducer per le liste accumulate nello stato.
+
+    A differenza di operator.add non crea una lista nuova ad ogni
+    update: estende quella esistente in place. La history cresce ad
+    ogni nodo e il costo di ricopiarla era quadratico.
+    """
+    left.extend(right)
+    return left
 
 
 class WorkflowStatus(str, Enum):
@@ -82,6 +93,7 @@ class WorkflowState(TypedDict, total=False):
     status: WorkflowStatus
     current_agent: str
     started_at: str
+    started_mono: float  # time.monotonic() alla partenza, per le durate
     completed_at: Optional[str]
     
     # Risultati per fase
@@ -90,8 +102,8 @@ class WorkflowState(TypedDict, total=False):
     synthesis_results: Optional[SynthesisResults]
     
     # Tracking
-    agent_history: Annotated[List[AgentResult], operator.add]  # Accumula risultati
-    errors: Annotated[List[str], operator.add]  # Accumula errori
+    agent_history: Annotated[List[AgentResult], extend_list]  # Accumula risultati
+    errors: Annotated[List[str], extend_list]  # Accumula errori
     
     # Output finale
     final_output: Optional[Dict[str, Any]]
@@ -122,6 +134,7 @@ def create_initial_state(
         status=WorkflowStatus.PENDING,
         current_agent="",
         started_at=datetime.now().isoformat(),
+        started_mono=time.monotonic(),
         completed_at=None,
         research_results=None,
         analysis_results=None,
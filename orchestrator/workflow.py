@@ -11,11 +11,10 @@ Questo è il cuore del sistema A2A (Agent-to-Agent).
 
 import asyncio
 import time
+from functools import lru_cache
 from typing import Any, Dict, Optional, Literal
 from datetime import datetime
 
-from langgraph.graph import StateGraph, END
-
 from .state import (
     WorkflowState,
     WorkflowStatus,
@@ -26,14 +25,39 @@ from .state import (
 
 import sys
 sys.path.append("..")
-from agents import (
-    create_research_agent,
-    create_analysis_agent,
-    create_synthesis_agent
-)
 from config import VERBOSE
 
 
+# =============================================================================
+# Agent Accessors
+# =============================================================================
+
+# Un'istanza condivisa per agente, creata al primo nodo che la usa.
+# Gli import di agents (che trascinano langchain) avvengono qui dentro:
+# importare orchestrator resta leggero e i run successivi riusano gli
+# agenti già inizializzati invece di ricrearli ad ogni nodo.
+
+@lru_cache(maxsize=None)
+def _research_agent():
+    """Istanza condivisa del Research Agent."""
+    from agents import create_research_agent
+    return create_research_agent()
+
+
+@lru_cache(maxsize=None)
+def _analysis_agent():
+    """Istanza condivisa dell'Analysis Agent."""
+    from agents import create_analysis_agent
+    return create_analysis_agent()
+
+
+@lru_cache(maxsize=None)
+def _synthesis_agent():
+    """Istanza condivisa del Synthesis Agent."""
+    from agents import create_synthesis_agent
+    return create_synthesis_agent()
+
+
 # =============================================================================
 # Node Functions (eseguite dal grafo)
 # =============================================================================
@@ -53,7 +77,7 @@ async def research_node(state: WorkflowState) -> Dict[str, Any]:
     start_time = time.time()
     
     # Crea/ottieni agente
-    agent = create_research_agent()
+    agent = _research_agent()
     
     # Estrai parametri
     query = state["query"]
@@ -136,7 +160,7 @@ async def analysis_node(state: WorkflowState) -> Dict[str, Any]:
         }
     
     # Crea/ottieni agente
-    agent = create_analysis_agent()
+    agent = _analysis_agent()
     
     try:
         # Analizza risultati ricerca
@@ -211,7 +235,7 @@ async def synthesis_node(state: WorkflowState) -> Dict[str, Any]:
         }
     
     # Crea/ottieni agente
-    agent = create_synthesis_agent()
+    agent = _synthesis_agent()
     
     # Parametri
     options = state.get("options", {})
@@ -304,9 +328,15 @@ async def finalize_node(state: WorkflowState) -> Dict[str, Any]:
             "gaps": state["analysis_results"].get("lacune", [])
         }
     
-    # Calcola tempo totale
-    started = datetime.fromisoformat(state["started_at"])
-    total_duration = (datetime.now() - started).total_seconds()
+    # Calcola tempo totale: clock monotonico, immune a cambi dell'ora
+    # di sistema e senza parse della stringa ISO (che resta nello stato
+    # solo per la serializzazione)
+    started_mono = state.get("started_mono")
+    if started_mono is not None:
+        total_duration = time.monotonic() - started_mono
+    else:
+        started = datetime.fromisoformat(state["started_at"])
+        total_duration = (datetime.now() - started).total_seconds()
     final_output["total_duration_seconds"] = round(total_duration, 1)
     
     if VERBOSE:
@@ -332,16 +362,19 @@ def should_continue(state: WorkflowState) -> Literal["continue", "end"]:
 # Graph Builder
 # =============================================================================
 
-def build_workflow_graph() -> StateGraph:
+def build_workflow_graph() -> "StateGraph":
     """
     Costruisce il grafo del workflow.
-    
+
     Struttura:
     START → research → analysis → synthesis → finalize → END
-    
+
     Con gestione errori: ogni nodo può portare a END in caso di fallimento.
     """
-    
+    # Import locale: langgraph serve solo a chi costruisce il grafo,
+    # il fast path lineare non lo tocca
+    from langgraph.graph import StateGraph, END
+
     # Crea grafo con tipo stato
     workflow = StateGraph(WorkflowState)
     
@@ -390,6 +423,41 @@ def build_workflow_graph() -> StateGraph:
     return workflow
 
 
+# =============================================================================
+# Fast Path (pipeline lineare)
+# =============================================================================
+
+def _merge_delta(state: WorkflowState, delta: Dict[str, Any]) -> None:
+    """Applica allo stato il delta restituito da un nodo.
+
+    Replica la semantica dei reducer LangGraph: le liste annotate
+    (agent_history, errors) si accumulano, gli altri campi vengono
+    sovrascritti.
+    """
+    for key, value in delta.items():
+        if key in ("agent_history", "errors"):
+            state.setdefault(key, []).extend(value)
+        else:
+            state[key] = value
+
+
+async def _run_linear(state: WorkflowState) -> WorkflowState:
+    """Esegue la pipeline senza passare dal runtime LangGraph.
+
+    Il grafo è una catena fissa research → analysis → synthesis →
+    finalize: invocare i nodi direttamente evita l'overhead per-step
+    del runtime (scheduling, copie dello stato, channel update),
+    mantenendo la stessa semantica di should_continue.
+    """
+    for node in (research_node, analysis_node, synthesis_node):
+        _merge_delta(state, await node(state))
+        if state.get("status") == WorkflowStatus.FAILED:
+            return state
+
+    _merge_delta(state, await finalize_node(state))
+    return state
+
+
 # =============================================================================
 # Main Orchestrator Class
 # =============================================================================
@@ -408,9 +476,23 @@ class ResearchOrchestrator:
     
     def __init__(self):
         """Inizializza l'orchestratore."""
-        self.graph = build_workflow_graph()
-        self.app = self.graph.compile()
+        self._graph = None
+        self._app = None
         self._run_count = 0
+
+    @property
+    def graph(self):
+        """Grafo LangGraph, costruito al primo accesso."""
+        if self._graph is None:
+            self._graph = build_workflow_graph()
+        return self._graph
+
+    @property
+    def app(self):
+        """Grafo compilato, per chi vuole invocarlo via API LangGraph."""
+        if self._app is None:
+            self._app = self.graph.compile()
+        return self._app
     
     async def run(
         self,
@@ -447,9 +529,10 @@ class ResearchOrchestrator:
             options=options or {}
         )
         
-        # Esegui workflow
+        # Esegui workflow (fast path lineare; self.app resta disponibile
+        # per chi vuole invocare il grafo LangGraph compilato)
         try:
-            final_state = await self.app.ainvoke(initial_state)
+            final_state = await _run_linear(initial_state)
             
             # Estrai output
             if final_state.get("final_output"):
@@ -517,6 +600,27 @@ class ResearchOrchestrator:
 # Convenience function
 # =============================================================================
 
+# Orchestratore condiviso: costruire il grafo e compilarlo ad ogni
+# chiamata di run_research è lavoro ripetuto; l'istanza è stateless tra
+# i run (lo stato vive nel WorkflowState) e può essere riusata
+_orchestrator: Optional[ResearchOrchestrator] = None
+_orchestrator_lock = asyncio.Lock()
+
+
+async def _get_orchestrator() -> ResearchOrchestrator:
+    """Restituisce l'orchestratore condiviso, creandolo al primo uso.
+
+    Il lock serializza solo la prima costruzione: run_research può
+    essere invocata da più coroutine concorrenti (es. demo in gather).
+    """
+    global _orchestrator
+    if _orchestrator is None:
+        async with _orchestrator_lock:
+            if _orchestrator is None:
+                _orchestrator = ResearchOrchestrator()
+    return _orchestrator
+
+
 async def run_research(
     query: str,
     include_news: bool = True,
@@ -535,8 +639,8 @@ async def run_research(
     Returns:
         Risultati della ricerca con report
     """
-    orchestrator = ResearchOrchestrator()
-    
+    orchestrator = await _get_orchestrator()
+
     return await orchestrator.run(
         query=query,
         options={
@@ -0,0 +1,17 @@
+"""
+Utils package.
+
+Utility condivise tra agenti e orchestratore:
+- token_budget: conteggio e troncamento token-aware dei contesti LLM
+- fastjson: serializzazione JSON via orjson con fallback stdlib
+"""
+
+from .token_budget import count_tokens, fit
+from .fastjson import json_loads, json_dumps
+
+__all__ = [
+    "count_tokens",
+    "fit",
+    "json_loads",
+    "json_dumps",
+]
@@ -0,0 +1,18 @@
+"""
+Console Rich condivisa a livello di processo.
+
+Console() costruisce a ogni istanza il rilevamento del terminale, il
+tema e i buffer di rendering: basta un'istanza per processo. Il
+singleton è pigro così rich viene importato solo da chi stampa davvero.
+"""
+
+_console = None
+
+
+def get_console():
+    """Restituisce la Console condivisa, creandola al primo uso."""
+    global _console
+    if _console is None:
+        from rich.console import Console
+        _console = Console()
+    return _console
@@ -0,0 +1,42 @@
+"""
+Serializzazione JSON veloce.
+
+Usa orjson (parser C con scan SIMD, 3-10x più rapido dello stdlib)
+quando installato, con fallback trasparente su json. orjson serializza
+nativamente datetime e dataclass, evitando isoformat()/asdict manuali.
+
+json_dumps restituisce sempre str; gli errori di parsing sono sempre
+sottoclassi di ValueError, in entrambi i backend.
+"""
+
+from typing import Any
+
+try:
+    import orjson
+
+    def json_loads(data) -> Any:
+        """Parsa JSON da str/bytes."""
+        return orjson.loads(data)
+
+    def json_dumps(obj: Any, indent: bool = False) -> str:
+        """Serializza in JSON (datetime e dataclass supportati)."""
+        option = orjson.OPT_SERIALIZE_DATACLASS | orjson.OPT_NAIVE_UTC
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option).decode()
+
+except ImportError:
+    import json as _json
+
+    def json_loads(data) -> Any:
+        """Parsa JSON da str/bytes."""
+        return _json.loads(data)
+
+    def json_dumps(obj: Any, indent: bool = False) -> str:
+        """Serializza in JSON (default=str per datetime e simili)."""
+        return _json.dumps(
+            obj,
+            ensure_ascii=False,
+            indent=2 if indent else None,
+            default=str
+        )
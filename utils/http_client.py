@@ -0,0 +1,47 @@
+"""
+Client HTTP condiviso a livello di processo.
+
+I check verso Ollama (``/api/tags``) vengono ripetuti a ogni avvio CLI e
+in ogni demo: un client per chiamata paga ogni volta l'handshake TCP.
+Qui il client è un singleton pigro con pool keep-alive, così le chiamate
+successive riusano la connessione; la chiusura è registrata in atexit.
+"""
+
+import atexit
+
+_client = None
+
+
+def get_http_client():
+    """Restituisce il client httpx condiviso, creandolo al primo uso."""
+    global _client
+    import httpx
+
+    from config import (
+        HTTP_MAX_CONNECTIONS,
+        HTTP_MAX_KEEPALIVE,
+        HTTP_KEEPALIVE_EXPIRY,
+        HTTP_POOL_TIMEOUT
+    )
+
+    if _client is None or _client.is_closed:
+        _client = httpx.Client(
+            timeout=httpx.Timeout(5.0, connect=2.0, pool=HTTP_POOL_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+            )
+        )
+    return _client
+
+
+def close_http_client() -> None:
+    """Chiude il client condiviso (idempotente)."""
+    global _client
+    if _client is not None and not _client.is_closed:
+        _client.close()
+    _client = None
+
+
+atexit.register(close_http_client)
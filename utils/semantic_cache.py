@@ -0,0 +1,131 @@
+"""
+Cache semantica per risposte LLM.
+
+Restituisce una risposta già generata quando un nuovo prompt è
+*semanticamente* vicino a uno già visto (similarità coseno degli
+embeddings sopra soglia), evitando del tutto la generazione.
+
+Dipende dagli extra RAG opzionali (sentence-transformers + faiss-cpu):
+se mancano la cache è semplicemente disabilitata e ogni lookup fallisce
+in modo innocuo. L'indice e le risposte sono persistiti su disco sotto
+``CACHE_DIR`` e sopravvivono ai riavvii.
+"""
+
+import hashlib
+import time
+from pathlib import Path
+from typing import Any, List, Optional
+
+from utils.fastjson import json_dumps, json_loads
+
+try:
+    import faiss
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+    _HAS_DEPS = True
+except ImportError:
+    _HAS_DEPS = False
+
+
+class SemanticCache:
+    """
+    Indice FAISS (inner product su embeddings normalizzati = coseno) con
+    sidecar JSON ``id -> {response, ts}``.
+    """
+
+    __slots__ = ("_dir", "_threshold", "_ttl", "_model_name",
+                 "_model", "_index", "_entries")
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        model_name: str,
+        threshold: float = 0.95,
+        ttl: int = 7 * 86400
+    ):
+        self._dir = cache_dir
+        self._threshold = threshold
+        self._ttl = ttl
+        self._model_name = model_name
+        self._model = None       # caricato pigramente al primo uso
+        self._index = None
+        self._entries: List[dict] = []
+
+    @property
+    def available(self) -> bool:
+        """True se gli extra opzionali (faiss, sentence-transformers) ci sono."""
+        return _HAS_DEPS
+
+    # -------------------------------------------------------------------------
+    # Lazy init / persistenza
+    # -------------------------------------------------------------------------
+
+    def _ensure_loaded(self) -> None:
+        if self._model is not None:
+            return
+
+        self._model = SentenceTransformer(self._model_name)
+
+        index_path = self._dir / "llm_cache.faiss"
+        entries_path = self._dir / "llm_cache_entries.json"
+        if index_path.exists() and entries_path.exists():
+            try:
+                self._index = faiss.read_index(str(index_path))
+                self._entries = json_loads(entries_path.read_text(encoding="utf-8"))
+            except Exception:
+                self._index = None
+                self._entries = []
+
+        if self._index is None:
+            dim = self._model.get_sentence_embedding_dimension()
+            self._index = faiss.IndexFlatIP(dim)
+            self._entries = []
+
+    def _persist(self) -> None:
+        try:
+            self._dir.mkdir(parents=True, exist_ok=True)
+            faiss.write_index(self._index, str(self._dir / "llm_cache.faiss"))
+            (self._dir / "llm_cache_entries.json").write_text(
+                json_dumps(self._entries), encoding="utf-8"
+            )
+        except Exception:
+            pass
+
+    def _embed(self, text: str) -> "np.ndarray":
+        vec = self._model.encode([text], show_progress_bar=False)
+        vec = np.asarray(vec, dtype="float32")
+        faiss.normalize_L2(vec)
+        return vec
+
+    # -------------------------------------------------------------------------
+    # API
+    # -------------------------------------------------------------------------
+
+    def get(self, prompt: str) -> Optional[str]:
+        """Risposta cacheata per un prompt semanticamente simile, o None."""
+        if not _HAS_DEPS:
+            return None
+
+        self._ensure_loaded()
+        if self._index.ntotal == 0:
+            return None
+
+        scores, ids = self._index.search(self._embed(prompt), 1)
+        score, idx = float(scores[0][0]), int(ids[0][0])
+        if idx < 0 or score < self._threshold:
+            return None
+
+        entry = self._entries[idx]
+        if time.time() - entry.get("ts", 0) > self._ttl:
+            return None
+        return entry["response"]
+
+    def put(self, prompt: str, response: str) -> None:
+        """Registra (prompt, risposta) nell'indice e persiste su disco."""
+        if not _HAS_DEPS:
+            return
+
+        self._ensure_loaded()
+        self._index.add(self._embed(prompt))
+        self._entries.append({"response": response, "ts": time.time()})
+        self._persist()
@@ -0,0 +1,81 @@
+"""
+Budget di token per i contesti passati al LLM.
+
+I limiti in caratteri (es. [:200], [:8000]) sono un proxy impreciso del
+numero di token: contesti troppo corti sprecano budget disponibile,
+troppo lunghi vengono troncati a metà token dal modello. Qui si conta
+con tiktoken quando disponibile, altrimenti con una stima a ~4
+caratteri per token.
+"""
+
+from functools import lru_cache
+from typing import Optional
+
+# Stima usata dal fallback quando tiktoken non è installato
+_CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=4)
+def _get_encoding(name: str = "cl100k_base"):
+    """Carica (una volta sola) l'encoding tiktoken, None se assente."""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding(name)
+    except Exception:
+        return None
+
+
+def count_tokens(text: str, encoding_name: str = "cl100k_base") -> int:
+    """
+    Conta i token di un testo.
+
+    Args:
+        text: Testo da misurare
+        encoding_name: Nome encoding tiktoken
+
+    Returns:
+        Numero di token (stimato se tiktoken non è disponibile)
+    """
+    enc = _get_encoding(encoding_name)
+    if enc is not None:
+        return len(enc.encode(text))
+    return max(1, len(text) // _CHARS_PER_TOKEN) if text else 0
+
+
+def fit(
+    text: str,
+    max_tokens: int,
+    encoding_name: str = "cl100k_base",
+    suffix: Optional[str] = None
+) -> str:
+    """
+    Tronca un testo al budget di token indicato.
+
+    Il taglio avviene sul confine di token (mai a metà), così il
+    contesto inviato al modello resta ben formato.
+
+    Args:
+        text: Testo da troncare
+        max_tokens: Budget massimo di token
+        encoding_name: Nome encoding tiktoken
+        suffix: Testo da appendere se il troncamento avviene
+
+    Returns:
+        Testo entro il budget
+    """
+    if not text:
+        return text
+
+    enc = _get_encoding(encoding_name)
+    if enc is not None:
+        tokens = enc.encode(text)
+        if len(tokens) <= max_tokens:
+            return text
+        truncated = enc.decode(tokens[:max_tokens])
+    else:
+        limit = max_tokens * _CHARS_PER_TOKEN
+        if len(text) <= limit:
+            return text
+        truncated = text[:limit]
+
+    return truncated + suffix if suffix else truncated